@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Headless benchmarks for the GeppEmoji data pipeline.
+
+Runs without GTK or a display and times the steps that make up startup and
+searching, on the real database and on synthetic copies scaled 10x / 100x:
+
+- build_emoji_db()              parsing emoji-test.txt in the builder
+- streaming build               file -> iter_emoji_entries -> JSON + binary writers
+- json load / binary load       reading emoji_data.json / emoji_data.bin
+- language packs                core DB + the packs of one language and English
+- normalize_skin_tones()
+- emoji_records()               dicts -> compact Emoji records
+- merge_translations()          (apply_translations_to_emoji_list)
+- get_all_keywords()            over all items
+- SearchIndex build and queries (realistic typing sequences)
+- CategoryIndex                 build, and category switches with no search text
+- SnapshotCache                 warm-start load of the merged list + search index
+
+Each step reports the median wall time over --repeat runs and its peak
+Python memory (tracemalloc, measured in a separate run so it does not
+slow down the timings).
+
+Usage:
+    python3 benchmarks/bench_data.py                      # scales 1 10 100
+    python3 benchmarks/bench_data.py --scale 1 10 --repeat 3
+    python3 benchmarks/bench_data.py --json results.json
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from build_emoji_db import (  # noqa: E402
+    JsonArrayWriter,
+    LanguagePackWriter,
+    build_emoji_db,
+    iter_emoji_entries,
+    split_language_data,
+    write_language_packs,
+)
+from emoji_db_binary import BinaryDBWriter, BinaryEmojiDB, write_binary_db  # noqa: E402
+from geppemoji_core import (  # noqa: E402
+    CategoryIndex,
+    SearchIndex,
+    SnapshotCache,
+    emoji_records,
+    get_all_keywords,
+    merge_translations,
+    normalize_skin_tones,
+    pack_languages,
+    read_language_packs,
+)
+
+EMOJI_FILE = os.path.join(ROOT, "emoji_data.json")
+TRANSLATIONS_FILE = os.path.join(ROOT, "emoji_translations.json")
+EMOJI_TEST_FILE = os.path.join(ROOT, "emoji-test.txt")
+
+# What people actually type: each word is fed one character at a time,
+# like the search entry does.
+TYPED_WORDS = ["heart", "smile", "cat", "thumbs up", "flag", "fire", "cuore", "ok", "x"]
+
+CATEGORIES = ["All", "Smileys & Emotion", "Flags", "Recent", "Favorites"]
+
+LANGUAGE = "it"
+
+
+# ---------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------
+
+def scale_items(items, factor):
+    """
+    Return `factor` copies of `items`. Copies get a private-use suffix on
+    the char and a numbered name, so they stay distinct everywhere.
+    """
+    result = copy.deepcopy(items)
+    for k in range(1, factor):
+        suffix = chr(0xF0000 + k)
+        for item in items:
+            clone = copy.deepcopy(item)
+            clone["char"] = item.get("char", "") + suffix
+            names = clone.get("names")
+            if isinstance(names, dict):
+                for lang in names:
+                    names[lang] = f"{names[lang]} {k}"
+            result.append(clone)
+    return result
+
+
+def emoji_test_text(items):
+    """Render items back into the emoji-test.txt format the builder parses."""
+    lines = ["# emoji-test.txt (synthetic)", ""]
+    group = None
+    for item in items:
+        category = item.get("category", "Other")
+        if category != group:
+            group = category
+            lines.append(f"# group: {group}")
+        char = item.get("char", "")
+        codepoints = item.get("codepoints") or " ".join(f"{ord(c):04X}" for c in char)
+        name = item.get("names", {}).get("en", "")
+        lines.append(f"{codepoints:<40} ; fully-qualified     # {char} {name}")
+    return "\n".join(lines) + "\n"
+
+
+def typing_queries():
+    queries = []
+    for word in TYPED_WORDS:
+        queries += [word[:n] for n in range(1, len(word) + 1)]
+    return queries
+
+
+# ---------------------------------------------------------------------
+# Measuring
+# ---------------------------------------------------------------------
+
+def measure(name, func, setup, repeat):
+    """Time func(setup()) `repeat` times, then once more under tracemalloc."""
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        t0 = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - t0)
+
+    arg = setup()
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": name,
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_scale(base_items, translations, test_text, factor, repeat, tmp_dir):
+    items = scale_items(base_items, factor)
+    text = test_text if factor == 1 and test_text else emoji_test_text(items)
+
+    json_path = os.path.join(tmp_dir, f"emoji_data_{factor}x.json")
+    bin_path = os.path.join(tmp_dir, f"emoji_data_{factor}x.bin")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False)
+    write_binary_db(items, bin_path)
+    text_path = os.path.join(tmp_dir, f"emoji-test_{factor}x.txt")
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    packs = {}
+    core_items = [split_language_data(item, packs) for item in copy.deepcopy(items)]
+    core_path = os.path.join(tmp_dir, f"emoji_core_{factor}x.json")
+    packs_dir = os.path.join(tmp_dir, f"packs_{factor}x")
+    with open(core_path, "w", encoding="utf-8") as f:
+        json.dump(core_items, f, ensure_ascii=False)
+    write_language_packs(packs_dir, packs)
+
+    def streaming_build(_):
+        json_writer = JsonArrayWriter(os.path.join(tmp_dir, "out.json"))
+        binary_writer = BinaryDBWriter(os.path.join(tmp_dir, "out.bin"))
+        pack_writer = LanguagePackWriter(os.path.join(tmp_dir, "out_packs"))
+        with open(text_path, "r", encoding="utf-8") as f:
+            for item in iter_emoji_entries(f, translations):
+                core = pack_writer.add(item)
+                json_writer.add(core)
+                binary_writer.add(core)
+        json_writer.close()
+        binary_writer.close()
+        pack_writer.close()
+
+    def load_json(_):
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_binary(_):
+        db = BinaryEmojiDB(bin_path)
+        data = list(db)
+        db.close()
+        return data
+
+    def load_with_packs(_):
+        with open(core_path, "r", encoding="utf-8") as f:
+            data = normalize_skin_tones(json.load(f))
+        languages = pack_languages(LANGUAGE)
+        return emoji_records(data, languages, read_language_packs(packs_dir, languages))
+
+    def fresh_items():
+        return copy.deepcopy(items)
+
+    records = emoji_records(items)
+    keywords = [get_all_keywords(item, LANGUAGE) for item in records]
+    queries = typing_queries()
+
+    def typed(index):
+        for query in queries:
+            index.search(query)
+
+    def uncached(index):
+        for query in queries:
+            index.clear_cache()
+            index.search(query)
+
+    def switch_categories(index):
+        for category in CATEGORIES:
+            index.ids_for(category)
+
+    def category_index():
+        index = CategoryIndex(records)
+        index.set_recent([item.char for item in records[:60]])
+        index.set_favorites([item.char for item in records[::50]])
+        return index
+
+    snapshot = SnapshotCache(os.path.join(tmp_dir, f"snapshot_{factor}x.pickle"),
+                             [json_path, bin_path], LANGUAGE, tuple)
+    prepared = emoji_records(items)
+    merge_translations(prepared, translations, LANGUAGE)
+    snapshot.save((translations, prepared, SearchIndex(keywords)), snapshot.stamp())
+
+    empty_translations = {"by_shortcode": {}, "by_char": {}}
+    results = [
+        measure("build_emoji_db (parse emoji-test.txt)",
+                lambda _: build_emoji_db(text, empty_translations), lambda: None, repeat),
+        measure("streaming build (json + bin written)", streaming_build, lambda: None, repeat),
+        measure("json load", load_json, lambda: None, repeat),
+        measure("binary load", load_binary, lambda: None, repeat),
+        measure(f"core + packs ({', '.join(pack_languages(LANGUAGE))}) to records",
+                load_with_packs, lambda: None, repeat),
+        measure("normalize_skin_tones", normalize_skin_tones, fresh_items, repeat),
+        measure("emoji_records", emoji_records, lambda: items, repeat),
+        measure("merge_translations",
+                lambda data: merge_translations(data, translations, LANGUAGE),
+                lambda: emoji_records(items), repeat),
+        measure("get_all_keywords (all items)",
+                lambda _: [get_all_keywords(item, LANGUAGE) for item in records], lambda: None, repeat),
+        measure("SearchIndex build", SearchIndex, lambda: keywords, repeat),
+        measure(f"search, typing ({len(queries)} queries)", typed,
+                lambda: SearchIndex(keywords), repeat),
+        measure(f"search, uncached ({len(queries)} queries)", uncached,
+                lambda: SearchIndex(keywords), repeat),
+        measure("CategoryIndex build", CategoryIndex, lambda: records, repeat),
+        measure(f"category switch ({len(CATEGORIES)} categories)",
+                switch_categories, category_index, repeat),
+        measure("snapshot load (warm start)", lambda _: snapshot.load(), lambda: None, repeat),
+    ]
+    return {"scale": factor, "items": len(items), "results": results}
+
+
+def print_scale(entry):
+    print(f"\n== scale {entry['scale']}x ({entry['items']} items) ==")
+    print(f"{'operation':<42} {'median ms':>10} {'min ms':>10} {'peak KiB':>10}")
+    for r in entry["results"]:
+        print(f"{r['name']:<42} {r['median_ms']:>10.2f} {r['min_ms']:>10.2f} {r['peak_kib']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless GeppEmoji data benchmarks")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100],
+                        help="database size multipliers (default: 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per operation")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    with open(EMOJI_FILE, "r", encoding="utf-8") as f:
+        base_items = json.load(f)
+
+    translations = {"by_shortcode": {}, "by_char": {}}
+    if os.path.exists(TRANSLATIONS_FILE):
+        with open(TRANSLATIONS_FILE, "r", encoding="utf-8") as f:
+            translations = json.load(f)
+
+    test_text = None
+    if os.path.exists(EMOJI_TEST_FILE):
+        with open(EMOJI_TEST_FILE, "r", encoding="utf-8") as f:
+            test_text = f.read()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "scales": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="geppemoji-bench-") as tmp_dir:
+        for factor in args.scale:
+            entry = run_scale(base_items, translations, test_text, factor, args.repeat, tmp_dir)
+            report["scales"].append(entry)
+            print_scale(entry)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
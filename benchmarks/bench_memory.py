@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Resident memory of the loaded emoji list: plain dicts vs Emoji records.
+
+For each scale, the normalized emoji list is pickled once as dicts (the
+emoji_data.json shape) and once as Emoji records (what the app keeps, and
+what its warm-start snapshot holds). Each pickle is then loaded in a fresh
+interpreter, and the RSS growth it causes is reported.
+
+Usage:
+    python3 benchmarks/bench_memory.py                 # scales 1 10
+    python3 benchmarks/bench_memory.py --scale 1 10 100
+"""
+
+import argparse
+import gc
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_data import EMOJI_FILE, scale_items  # noqa: E402
+from geppemoji_core import emoji_records, normalize_skin_tones  # noqa: E402
+
+
+def rss_kib():
+    """Current resident set size of this process, in KiB."""
+    with open("/proc/self/status", "r", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+def child(path):
+    """Load one pickle and print the RSS it added (runs in a fresh interpreter)."""
+    gc.collect()
+    before = rss_kib()
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    gc.collect()
+    print(rss_kib() - before, len(data))
+
+
+def measure(path):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", path],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return int(out[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emoji list memory: dicts vs records")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10],
+                        help="database size multipliers (default: 1 10)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    with open(EMOJI_FILE, "r", encoding="utf-8") as f:
+        base_items = json.load(f)
+
+    print(f"{'scale':>6} {'items':>8} {'dicts KiB':>12} {'records KiB':>12} {'saved':>7}")
+    with tempfile.TemporaryDirectory(prefix="geppemoji-mem-") as tmp_dir:
+        for factor in args.scale:
+            items = normalize_skin_tones(scale_items(base_items, factor))
+            dicts_path = os.path.join(tmp_dir, f"dicts_{factor}x.pickle")
+            records_path = os.path.join(tmp_dir, f"records_{factor}x.pickle")
+            with open(dicts_path, "wb") as f:
+                pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(records_path, "wb") as f:
+                pickle.dump(emoji_records(items), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            dicts_kib = measure(dicts_path)
+            records_kib = measure(records_path)
+            saved = 1 - records_kib / dicts_kib if dicts_kib else 0
+            print(f"{factor:>5}x {len(items):>8} {dicts_kib:>12} {records_kib:>12} {saved:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
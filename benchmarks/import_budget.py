@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for GeppEmoji.
+
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and parses the report to check that:
+
+- the import stays within its time budget (our own modules and the stdlib
+  modules they pull in; `gi` is reported separately, it is not ours to trim);
+- none of the modules that must load on first use (zipfile, subprocess,
+  datetime, ...) is imported directly by our modules.
+
+Exits with status 1 if a check fails, so it can run in CI. Timings depend on
+the machine: --scale multiplies every budget (e.g. --scale 2 on slow runners).
+
+Usage:
+    python3 benchmarks/import_budget.py
+    python3 benchmarks/import_budget.py --scale 2 --repeat 7 -v
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Our modules: whatever they import directly is checked against DEFERRED
+OWN_MODULES = ("geppemoji", "emoji_db_binary", "build_emoji_db")
+
+# Third-party packages, timed apart from the budget
+EXTERNAL = ("gi",)
+
+# Only needed by rarely used features (backup/restore, update dialog, daemon,
+# xdotool, ...): they must be imported where they are used
+DEFERRED = (
+    "datetime",
+    "re",
+    "socket",
+    "subprocess",
+    "tempfile",
+    "zipfile",
+    "geppemoji_i18n",
+)
+
+# Known exceptions: importer -> DEFERRED modules it may import at startup
+ALLOWED = {}
+
+# (entry point, budget in ms)
+TARGETS = [
+    ("geppemoji_core", 20),
+    ("geppemoji_query", 30),
+    ("geppemoji", 40),
+]
+
+
+class Node:
+    def __init__(self, name, self_us, cumulative_us):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = []
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into a list of top-level Nodes.
+
+    Lines come in post-order (children first, indented two more spaces
+    than their parent), so each line adopts the pending deeper ones.
+    """
+    pending = {}    # depth -> nodes waiting for their parent
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|", 2)
+        try:
+            self_us = int(fields[0])
+            cumulative_us = int(fields[1])
+            name = fields[2]
+        except (ValueError, IndexError):
+            continue
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        node = Node(stripped.strip(), self_us, cumulative_us)
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def is_own(name):
+    return name.split(".")[0].startswith(OWN_MODULES)
+
+
+def is_external(name):
+    return name.split(".")[0] in EXTERNAL
+
+
+def walk(nodes):
+    for node in nodes:
+        yield node
+        yield from walk(node.children)
+
+
+def external_us(nodes):
+    """Time spent importing EXTERNAL packages (outermost ones only)."""
+    total = 0
+    for node in nodes:
+        if is_external(node.name):
+            total += node.cumulative_us
+        else:
+            total += external_us(node.children)
+    return total
+
+
+def deferred_imports(node):
+    """Return (importer, module) pairs for DEFERRED modules imported by our code."""
+    found = []
+    for own in walk([node]):
+        if not is_own(own.name):
+            continue
+        allowed = ALLOWED.get(own.name, ())
+        for child in own.children:
+            if child.name in DEFERRED and child.name not in allowed:
+                found.append((own.name, child.name))
+    return found
+
+
+def import_once(module):
+    """Import `module` in a fresh interpreter; return (top-level nodes, error)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1:] or ["import failed"]
+        return None, last[0]
+    return parse_importtime(proc.stderr), None
+
+
+def measure(module, repeat):
+    """
+    Import `module` `repeat` times; return (own ms, external ms, last Node, error),
+    the times being medians. On error the other fields are None.
+    """
+    # Time imports from cached bytecode, as an installed app starts
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    subprocess.run([sys.executable, "-c", f"import {module}"],
+                   cwd=ROOT, env=env, capture_output=True)
+
+    own_times = []
+    ext_times = []
+    node = None
+    for _ in range(repeat):
+        nodes, error = import_once(module)
+        if error:
+            return None, None, None, error
+        node = next((n for n in nodes if n.name == module), None)
+        if node is None:
+            return None, None, None, "not in the importtime report"
+        ext = external_us([node])
+        ext_times.append(ext)
+        own_times.append(node.cumulative_us - ext)
+    return (statistics.median(own_times) / 1000,
+            statistics.median(ext_times) / 1000, node, None)
+
+
+def check(module, budget_ms, repeat, verbose):
+    """Return True if `module` passes, False if not, None if it cannot be imported."""
+    own_ms, ext_ms, node, error = measure(module, repeat)
+    if error:
+        print(f"{module:<18} skipped: {error}")
+        return None
+    offenders = deferred_imports(node)
+
+    ok = own_ms <= budget_ms and not offenders
+    status = "ok" if ok else "FAIL"
+    print(f"{module:<18} {own_ms:8.1f} ms / {budget_ms:6.1f} ms budget"
+          f"   (+ {ext_ms:.1f} ms external)   {status}")
+    for importer, name in offenders:
+        print(f"    {importer} imports {name} at startup (import it on first use)")
+    if verbose:
+        slowest = sorted(walk(node.children), key=lambda n: n.self_us, reverse=True)[:8]
+        for n in slowest:
+            print(f"    {n.self_us / 1000:8.2f} ms  {n.name}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GeppEmoji import-time budget check")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh imports per module (median)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list the slowest imports")
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget_ms in TARGETS:
+        ok = check(module, budget_ms * args.scale, args.repeat, args.verbose)
+        failed |= ok is False
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
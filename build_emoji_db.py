@@ -4,48 +4,211 @@ Build the emoji database for GeppEmoji.
 
 This script parses the official Unicode emoji-test.txt file and generates
 `emoji_data.json`, optionally applying local overrides from
-`emoji_translations.json`.
+`emoji_translations.json`. The same data is also compiled into
+`emoji_data.bin`, a compact memory-mapped copy that the app loads faster.
 
-- Download emoji-test.txt from:
-  https://unicode.org/Public/emoji/latest/emoji-test.txt
+- Names and keywords do not go into those files: they are written to one
+  pack per language, `emoji_packs/<lang>.json`, so that the app only
+  reads the languages it shows (the current one and English).
 
-- Put it in the same folder as this script (or let the script download it).
+- The script keeps a local copy of emoji-test.txt (downloaded from
+  https://unicode.org/Public/emoji/latest/emoji-test.txt, or saved there
+  by hand) and revalidates it with a conditional request on every run.
+  When neither the source nor emoji_translations.json changed since the
+  last build, nothing is rebuilt.
 
 - Run:
-    python3 build_emoji_db.py
+    python3 build_emoji_db.py [--offline] [--force] [--url URL] [--progress]
+
+  --offline   use the local copy only, no network
+  --force     rebuild even if nothing changed
+  --url       fetch the source from another URL (default: the Unicode one,
+              or $GEPPEMOJI_EMOJI_TEST_URL)
+  --progress  also print machine-readable progress on stdout (see Progress)
 """
 
+import argparse
+import email.utils
+import hashlib
 import urllib.request
 import json
 import re
 import os
+import sys
+import tempfile
 from urllib.error import URLError, HTTPError
 
+from emoji_db_binary import BinaryDBWriter
+from geppemoji_core import (
+    add_skin_tone_variant,
+    atomic_write_json,
+    language_pack_file,
+    search_keywords,
+    skin_tone_index,
+    skin_tone_key,
+    split_version,
+)
+
 EMOJI_TEST_URL = "https://unicode.org/Public/emoji/latest/emoji-test.txt"
 LOCAL_EMOJI_TEST = "emoji-test.txt"
+SOURCE_CACHE_FILE = "emoji-test.cache.json"
 OUTPUT_FILE = "emoji_data.json"
+BINARY_OUTPUT_FILE = "emoji_data.bin"
 TRANSLATIONS_FILE = "emoji_translations.json"
+LANGUAGE_PACKS_DIR = "emoji_packs"
 
+# Bump when the entries change shape, so that existing outputs are rebuilt
+DB_FORMAT = 3
 
-def load_local_emoji_test():
-    """Try to load emoji-test.txt from the local directory."""
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), LOCAL_EMOJI_TEST)
-    if os.path.exists(path):
-        print(f"Using local {LOCAL_EMOJI_TEST} at {path}")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = 30
+
+
+def script_path(name):
+    """Return the path of `name` next to this script."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+# ---------------------------------------------------------------------
+# Cached source download
+# ---------------------------------------------------------------------
+
+def load_source_cache(path):
+    """
+    Load the source cache (emoji-test.cache.json):
+
+    {
+        "url": "...", "etag": "...", "last_modified": "...",
+        "built": {"format": 3, "source": "<sha256>", "translations": "<sha256>"}
+    }
+    """
+    try:
         with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    return None
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Ignoring unreadable {SOURCE_CACHE_FILE}: {e}")
+    return {}
+
+
+def save_source_cache(path, cache):
+    try:
+        atomic_write_json(path, cache, indent=2)
+    except Exception as e:
+        print(f"Error while saving {SOURCE_CACHE_FILE}: {e}")
+
+
+class Progress:
+    """
+    Progress of the build, for the app's "Update emoji DB" (--progress).
 
+    When enabled, stdout gets one JSON object per line between the usual
+    messages:
 
-def download_emoji_test():
-    """Download emoji-test.txt from Unicode if no local file is available."""
-    print(f"Downloading {EMOJI_TEST_URL} ...")
+        {"stage": "download", "done": 65536, "total": 612345}
+        {"stage": "parse", "done": 300000, "total": 612345}
+        {"stage": "done", "rebuilt": true, "count": 3944}
+
+    "total" is 0 when unknown. Steps are printed at most once per percent.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.last = {}      # stage -> last percent printed
+
+    def emit(self, **fields):
+        if self.enabled:
+            print(json.dumps(fields), flush=True)
+
+    def step(self, stage, done, total):
+        if not self.enabled:
+            return
+        percent = done * 100 // total if total else done // DOWNLOAD_CHUNK_SIZE
+        if self.last.get(stage) == percent:
+            return
+        self.last[stage] = percent
+        self.emit(stage=stage, done=done, total=total)
+
+
+def iter_source_lines(path, progress):
+    """Yield the lines of the UTF-8 file `path`, reporting the "parse" progress."""
+    total = os.path.getsize(path)
+    done = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            done += len(raw)
+            progress.step("parse", done, total)
+            yield raw.decode("utf-8")
+
+
+def file_sha256(path):
+    """Return the SHA-256 of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def fetch_emoji_test(url, path, cache, progress=None):
+    """
+    Refresh the local copy `path` of emoji-test.txt from `url`.
+
+    The request is conditional (If-None-Match / If-Modified-Since) when a
+    local copy exists, and a new body is streamed to a temp file which then
+    replaces `path`. The validators are stored in `cache`.
+
+    Return "modified", "not-modified", or None if the fetch failed.
+    """
+    progress = progress or Progress()
+    headers = {}
+    if os.path.exists(path):
+        if cache.get("url") == url and cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("url") == url and cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+        else:
+            # A copy saved by hand: only download if the server has a newer one
+            headers["If-Modified-Since"] = email.utils.formatdate(
+                os.path.getmtime(path), usegmt=True)
+
+    print(f"Checking {url} ...")
+    request = urllib.request.Request(url, headers=headers)
     try:
-        with urllib.request.urlopen(EMOJI_TEST_URL) as resp:
-            data = resp.read().decode("utf-8")
-        print("Download completed.")
-        return data
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as resp:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix="." + os.path.basename(path) + ".", dir=os.path.dirname(path))
+            try:
+                total = int(resp.headers.get("Content-Length") or 0)
+                done = 0
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in iter(lambda: resp.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        f.write(chunk)
+                        done += len(chunk)
+                        progress.step("download", done, total)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            cache["url"] = url
+            cache["etag"] = resp.headers.get("ETag")
+            cache["last_modified"] = resp.headers.get("Last-Modified")
+        print(f"Downloaded a new copy to {path}")
+        return "modified"
     except HTTPError as e:
+        if e.code == 304:
+            print(f"{LOCAL_EMOJI_TEST} is up to date.")
+            return "not-modified"
         print(f"HTTP error while downloading emoji-test.txt: {e}")
     except URLError as e:
         print(f"URL error while downloading emoji-test.txt: {e}")
@@ -54,17 +217,6 @@ def download_emoji_test():
     return None
 
 
-def save_local_emoji_test(text):
-    """Save a copy of emoji-test.txt locally, for reproducible builds."""
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), LOCAL_EMOJI_TEST)
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(text)
-        print(f"Saved a local copy to {path}")
-    except Exception as e:
-        print(f"Error while saving local emoji-test.txt: {e}")
-
-
 def load_translations():
     """
     Load optional overrides / translations from emoji_translations.json.
@@ -89,7 +241,7 @@ def load_translations():
         }
     }
     """
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), TRANSLATIONS_FILE)
+    path = script_path(TRANSLATIONS_FILE)
     if not os.path.exists(path):
         print("No translations file found (emoji_translations.json), continuing without overrides.")
         return {"by_shortcode": {}, "by_char": {}}
@@ -151,9 +303,46 @@ def apply_overrides(item, overrides):
     return item
 
 
-def build_emoji_db(emoji_test_text, translations):
+SHORTCODE_RE = re.compile(r"[^a-z0-9_]+")
+WORD_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+
+def iter_emoji_entries(lines, translations):
+    """
+    Parse emoji-test.txt lines (any iterable, e.g. an open file) and yield
+    one emoji entry per fully-qualified emoji, with the local overrides from
+    `translations` already applied.
+
+    Skin-tone variants are not entries of their own: they directly follow
+    their base emoji in emoji-test.txt and are collected into its
+    "skin_tones" list (one char per tone, light to dark, null if missing),
+    so the app can pick the right sequence, ZWJ ones included, without
+    touching the string. Variants mixing several tones are left out.
     """
-    Parse the emoji-test.txt content and build a list of emoji entries.
+    pending = None      # base entry still collecting its variants
+    pending_key = None
+
+    for item in _iter_fully_qualified(lines, translations):
+        char = item["char"]
+        tone = skin_tone_index(char)
+        if tone == 0:
+            if pending is not None:
+                yield pending
+            pending, pending_key = item, skin_tone_key(char)
+        elif tone > 0:
+            if pending is not None and skin_tone_key(char) == pending_key:
+                add_skin_tone_variant(pending, tone, char)
+            else:
+                # no base emoji for this variant, keep it as it is
+                yield item
+
+    if pending is not None:
+        yield pending
+
+
+def _iter_fully_qualified(lines, translations):
+    """
+    Yield one entry per fully-qualified line of emoji-test.txt.
 
     Each entry is a dict like:
     {
@@ -164,110 +353,297 @@ def build_emoji_db(emoji_test_text, translations):
             "en": "grinning face"
         },
         "keywords": {
-            "en": ["grinning", "face"]
+            "en": ["face", "grinning"]
         },
         "category": "Smileys & Emotion",
-        "favorite": false
+        "version": 1.0,
+        "favorite": false,
+        "search": {
+            "en": ["face", "grinning", "grinning face"]
+        },
+        "skin_tones": ["👋🏻", ...]   (added by iter_emoji_entries)
     }
+
+    "version" is the emoji version the source lists before the name
+    ("E1.0"), null if missing. "search" holds, per language, the lowercase
+    keywords the app searches (see geppemoji_core.search_keywords()).
     """
-    emojis = []
+    by_sc = translations.get("by_shortcode", {})
+    by_ch = translations.get("by_char", {})
     current_group = "Other"
 
-    for line in emoji_test_text.splitlines():
-        raw = line
+    for line in lines:
         line = line.strip()
 
-        # Unicode groups / categories
-        if line.startswith("# group:"):
-            current_group = line.split("group:", 1)[1].strip()
+        # ignore comments and empty lines, except the group headers
+        if not line:
             continue
-
-        # ignore comments and empty lines
-        if not line or line.startswith("#"):
+        if line[0] == "#":
+            # Unicode groups / categories
+            if line.startswith("# group:"):
+                current_group = line.split("group:", 1)[1].strip()
             continue
 
         # Typical format:
         # 1F600                                      ; fully-qualified     # 😀 grinning face
-        if ";" not in line or "#" not in line:
+        codepoints_part, sep, rest = line.partition(";")
+        if not sep:
             continue
-
-        try:
-            codepoints_part, rest = line.split(";", 1)
-            status_part, comment_part = rest.split("#", 1)
-        except ValueError:
+        status_part, sep, comment_part = rest.partition("#")
+        if not sep:
             continue
 
-        status = status_part.strip()
-        if status != "fully-qualified":
+        if status_part.strip() != "fully-qualified":
             # ignore non fully-qualified variants
             continue
 
-        comment_part = comment_part.strip()
         # comment_part is like: "😀 grinning face"
         parts = comment_part.split()
         if len(parts) < 2:
             continue
 
         char = parts[0]
-        name = " ".join(parts[1:]).lower()  # official English name in lowercase
+        # official English name in lowercase, after the version ("E1.0")
+        name, version = split_version(" ".join(parts[1:]).lower())
 
         # shortcode: based on the official name
-        shortcode = ":" + re.sub(r"[^a-z0-9_]+", "_", name).strip("_") + ":"
+        shortcode = ":" + SHORTCODE_RE.sub("_", name).strip("_") + ":"
 
         # keywords: split English name into words
-        keywords_en = list({w for w in re.split(r"[^a-z0-9]+", name) if w})
+        keywords_en = sorted({w for w in WORD_SPLIT_RE.split(name) if w})
 
-        codepoints = codepoints_part.strip()
         item = {
             "char": char,
-            "codepoints": codepoints,
+            "codepoints": codepoints_part.strip(),
             "shortcode": shortcode,
             "names": {"en": name},
             "keywords": {"en": keywords_en},
             "category": current_group,
+            "version": version,
             "favorite": False,
         }
-        emojis.append(item)
 
-    # Apply local translation overrides
-    by_sc = translations.get("by_shortcode", {})
-    by_ch = translations.get("by_char", {})
+        # Apply local translation overrides
+        if shortcode in by_sc:
+            item = apply_overrides(item, by_sc[shortcode])
+        if char in by_ch:
+            item = apply_overrides(item, by_ch[char])
+
+        names = item["names"]
+        keywords = item["keywords"]
+        extra = item.get("extra", [])
+        item["search"] = {
+            lang: search_keywords(names, keywords, extra, item["shortcode"], lang)
+            for lang in dict.fromkeys(["en", *names, *keywords])
+        }
 
-    for item in emojis:
-        sc = item.get("shortcode")
-        ch = item.get("char")
+        yield item
 
-        if sc in by_sc:
-            item = apply_overrides(item, by_sc[sc])
-        if ch in by_ch:
-            item = apply_overrides(item, by_ch[ch])
 
-    return emojis
+# entry field -> field of the language pack entries
+LANGUAGE_FIELDS = {"names": "name", "keywords": "keywords", "search": "search"}
 
 
-def main():
-    # 1) Try local file first
-    txt = load_local_emoji_test()
-    if txt is None:
-        # 2) Download if not present
-        txt = download_emoji_test()
-        if txt is None:
-            print("ERROR: Could not obtain emoji-test.txt (neither local nor remote).")
-            return
-        # Save a local copy for next runs
-        save_local_emoji_test(txt)
+def split_language_data(item, packs):
+    """
+    Move the per-language fields of `item` (names, keywords, search) into
+    `packs` ({lang: {char: {"name", "keywords", "search"}}}) and return
+    the language-neutral rest of the entry.
+    """
+    char = item["char"]
+    for field, key in LANGUAGE_FIELDS.items():
+        for lang, value in item.get(field, {}).items():
+            packs.setdefault(lang, {}).setdefault(char, {})[key] = value
+    return {k: v for k, v in item.items() if k not in LANGUAGE_FIELDS}
 
-    translations = load_translations()
-    db = build_emoji_db(txt, translations)
 
-    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), OUTPUT_FILE)
+def write_language_packs(directory, packs):
+    """Write one pack per language into `directory`, removing packs of languages gone."""
+    os.makedirs(directory, exist_ok=True)
+    for lang, pack in packs.items():
+        atomic_write_json(language_pack_file(directory, lang), pack, indent=2)
+    remove_other_packs(directory, packs)
+
+
+def remove_other_packs(directory, languages):
+    """Remove the packs in `directory` of languages not in `languages`."""
+    kept = {os.path.basename(language_pack_file(directory, lang)) for lang in languages}
+    for name in os.listdir(directory):
+        if name.endswith(".json") and name not in kept:
+            os.unlink(os.path.join(directory, name))
+
+
+def build_emoji_db(emoji_test_text, translations):
+    """Parse the whole emoji-test.txt content into a list of emoji entries."""
+    return list(iter_emoji_entries(emoji_test_text.splitlines(), translations))
+
 
-    print(f"Found {len(db)} emoji. Writing to {output_path} ...")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
+class JsonArrayWriter:
+    """
+    Write a JSON array one element at a time (to a temp file renamed into
+    place by close()), formatted exactly like json.dump(items, indent=2).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.tmp_path = tempfile.mkstemp(
+            prefix="." + os.path.basename(path) + ".", dir=directory)
+        self.file = os.fdopen(fd, "w", encoding="utf-8")
+        self.count = 0
+
+    OPEN, CLOSE = "[", "]"
+
+    def add(self, item):
+        self.write_element(json.dumps(item, ensure_ascii=False, indent=2))
+
+    def write_element(self, text):
+        self.file.write(",\n  " if self.count else self.OPEN + "\n  ")
+        self.file.write(text.replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self):
+        self.file.write("\n" + self.CLOSE if self.count else self.OPEN + self.CLOSE)
+        self.file.close()
+        os.chmod(self.tmp_path, 0o644)
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except OSError:
+            pass
+
+
+class JsonObjectWriter(JsonArrayWriter):
+    """Like JsonArrayWriter, for a JSON object written one member at a time."""
+
+    OPEN, CLOSE = "{", "}"
+
+    def add(self, key, value):
+        self.write_element(json.dumps(key, ensure_ascii=False) + ": "
+                           + json.dumps(value, ensure_ascii=False, indent=2))
+
+
+class LanguagePackWriter:
+    """
+    Write the language packs as entries come: each entry's names, keywords
+    and search keywords go straight to the pack of their language (one
+    JsonObjectWriter per language), so no pack is kept in memory.
+    close() also removes the packs of languages gone.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.writers = {}       # lang -> JsonObjectWriter
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, item):
+        """Write the per-language fields of `item`; return the rest of the entry."""
+        entries = {}
+        core = split_language_data(item, entries)
+        for lang, pack in entries.items():
+            writer = self.writers.get(lang)
+            if writer is None:
+                path = language_pack_file(self.directory, lang)
+                writer = self.writers[lang] = JsonObjectWriter(path)
+            for char, entry in pack.items():
+                writer.add(char, entry)
+        return core
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        remove_other_packs(self.directory, self.writers)
+
+    def abort(self):
+        for writer in self.writers.values():
+            writer.abort()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the GeppEmoji emoji database.")
+    parser.add_argument(
+        "--url",
+        default=os.environ.get("GEPPEMOJI_EMOJI_TEST_URL", EMOJI_TEST_URL),
+        help="where to fetch emoji-test.txt from",
+    )
+    parser.add_argument("--offline", action="store_true",
+                        help="use the local emoji-test.txt only")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even if the source did not change")
+    parser.add_argument("--progress", action="store_true",
+                        help="print progress as JSON lines on stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    progress = Progress(args.progress)
+    if args.progress:
+        # Read line by line through a pipe: do not hold messages back
+        sys.stdout.reconfigure(line_buffering=True)
+
+    source_path = script_path(LOCAL_EMOJI_TEST)
+    cache_path = script_path(SOURCE_CACHE_FILE)
+    output_path = script_path(OUTPUT_FILE)
+    binary_path = script_path(BINARY_OUTPUT_FILE)
+    packs_dir = script_path(LANGUAGE_PACKS_DIR)
+    cache = load_source_cache(cache_path)
+
+    # 1) Revalidate / download the source (keeping the local copy on failure)
+    if not args.offline:
+        if fetch_emoji_test(args.url, source_path, cache, progress) is not None:
+            save_source_cache(cache_path, cache)
+    if not os.path.exists(source_path):
+        print("ERROR: Could not obtain emoji-test.txt (neither local nor remote).")
+        return 1
+    print(f"Using local {LOCAL_EMOJI_TEST} at {source_path}")
+
+    # 2) Skip the build when its inputs did not change
+    inputs = {
+        "format": DB_FORMAT,
+        "source": file_sha256(source_path),
+        "translations": file_sha256(script_path(TRANSLATIONS_FILE)),
+    }
+    outputs = [output_path, binary_path, language_pack_file(packs_dir, "en")]
+    outputs_exist = all(os.path.exists(path) for path in outputs)
+    if not args.force and outputs_exist and cache.get("built") == inputs:
+        print("Source and translations unchanged, nothing to rebuild.")
+        progress.emit(stage="done", rebuilt=False)
+        return 0
+
+    translations = load_translations()
+
+    # 3) One pass: parse line by line, write all the outputs as entries
+    #    come (names and keywords to the language packs)
+    print(f"Writing {output_path}, {binary_path} and {packs_dir} ...")
+    json_writer = JsonArrayWriter(output_path)
+    binary_writer = BinaryDBWriter(binary_path)
+    pack_writer = LanguagePackWriter(packs_dir)
+    try:
+        for item in iter_emoji_entries(iter_source_lines(source_path, progress), translations):
+            core = pack_writer.add(item)
+            json_writer.add(core)
+            binary_writer.add(core)
+    except BaseException:
+        json_writer.abort()
+        binary_writer.abort()
+        pack_writer.abort()
+        raise
+    json_writer.close()
+    binary_writer.close()
+    pack_writer.close()
+    print(f"Found {json_writer.count} emoji, languages: {', '.join(sorted(pack_writer.writers))}.")
+
+    cache["built"] = inputs
+    save_source_cache(cache_path, cache)
 
     print("Done! You can now use emoji_data.json with GeppEmoji.")
+    progress.emit(stage="done", rebuilt=True, count=json_writer.count)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
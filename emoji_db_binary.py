@@ -0,0 +1,324 @@
+"""
+Compact binary form of the GeppEmoji database (`emoji_data.bin`).
+
+`emoji_data.json` stays the source / interchange format; `build_emoji_db.py`
+also compiles it into this file, which the app reads through `mmap`. The app
+still decodes every record at startup: the gain is that decoding is cheaper
+than parsing the JSON (no text to scan, each distinct string built once and
+shared), not that loading is deferred.
+
+Layout (all integers are little-endian uint32):
+
+    header      MAGIC, version, record count, string count, blob size,
+                pool length
+    strings     string count + 1 character offsets into the blob
+    blob        every distinct string (stored once), concatenated, UTF-8
+    records     one fixed-size record per emoji (RECORD layout below)
+    pool        variable-length lists referenced by the records
+
+A record stores string ids and pool offsets. Pool lists are encoded as
+`[count, values...]`; names and keywords are per-language:
+
+    names       [count, lang, name, lang, name, ...]
+    keywords    [count, lang, n, kw1..kwn, lang, n, ...]
+    search      [count, lang, n, kw1..kwn, lang, n, ...]   (like keywords)
+    extra       [count, kw1, kw2, ...]
+    skin_tones  [count, variant1, ..., variant5]   (NONE = no such variant)
+
+The emoji version is stored in hundredths (13.1 -> 1310). NONE marks a
+missing field, so decoding gives back the original dict (a missing
+version comes back as None, like the builder's null).
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+MAGIC = b"GEPPEMDB"
+VERSION = 3
+NONE = 0xFFFFFFFF
+
+HEADER = struct.Struct("<8sIIIII")
+# char, codepoints, shortcode, category, flags, version, names, keywords, extra,
+# skin_tones, search
+RECORD = struct.Struct("<IIIIIIIIIII")
+
+FLAG_FAVORITE = 1
+
+
+class _StringTable:
+    """Intern strings while writing and hand out their ids."""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def add(self, value):
+        if value is None:
+            return NONE
+        value = str(value)
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.ids[value] = idx
+            self.strings.append(value)
+        return idx
+
+
+def _u32_bytes(values):
+    """Pack a list of ints as little-endian uint32."""
+    arr = array("I", values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class BinaryDBWriter:
+    """
+    Compile emoji dicts into `path` one at a time.
+
+    Records and pool lists are spilled to temporary files as they come, so
+    only the (deduplicated) strings stay in memory; close() assembles the
+    final file next to `path` and renames it into place.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.strings = _StringTable()
+        self.records = tempfile.TemporaryFile()
+        self.pool = tempfile.TemporaryFile()
+        self.count = 0
+        self.pool_len = 0
+
+    def add(self, item):
+        add = self.strings.add
+        base = self.pool_len
+        values = []
+
+        names = item.get("names")
+        names_off = NONE
+        if isinstance(names, dict):
+            names_off = base + len(values)
+            values.append(len(names))
+            for lang, name in names.items():
+                values += [add(lang), add(name)]
+
+        def add_per_language(lists):
+            if not isinstance(lists, dict):
+                return NONE
+            offset = base + len(values)
+            values.append(len(lists))
+            for lang, words in lists.items():
+                values.extend([add(lang), len(words)])
+                values.extend(add(w) for w in words)
+            return offset
+
+        keywords_off = add_per_language(item.get("keywords"))
+
+        extra = item.get("extra")
+        extra_off = NONE
+        if isinstance(extra, list):
+            extra_off = base + len(values)
+            values.append(len(extra))
+            values += [add(w) for w in extra]
+
+        skin_tones = item.get("skin_tones")
+        skin_tones_off = NONE
+        if isinstance(skin_tones, list):
+            skin_tones_off = base + len(values)
+            values.append(len(skin_tones))
+            values += [add(v) for v in skin_tones]
+
+        search_off = add_per_language(item.get("search"))
+
+        version = item.get("version")
+        version = NONE if version is None else round(version * 100)
+
+        flags = FLAG_FAVORITE if item.get("favorite") else 0
+        self.records.write(RECORD.pack(
+            add(item.get("char")),
+            add(item.get("codepoints")),
+            add(item.get("shortcode")),
+            add(item.get("category")),
+            flags,
+            version,
+            names_off,
+            keywords_off,
+            extra_off,
+            skin_tones_off,
+            search_off,
+        ))
+        if values:
+            self.pool.write(_u32_bytes(values))
+            self.pool_len += len(values)
+        self.count += 1
+
+    def close(self):
+        """Write the final file atomically."""
+        strings = self.strings.strings
+        offsets = [0]
+        for value in strings:
+            offsets.append(offsets[-1] + len(value))
+        blob = "".join(strings).encode("utf-8")
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".emoji_data.", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(
+                    MAGIC, VERSION, self.count, len(strings), len(blob), self.pool_len))
+                f.write(_u32_bytes(offsets))
+                f.write(blob)
+                # keep the records and the pool 4-byte aligned
+                f.write(b"\0" * (-len(blob) % 4))
+                for spill in (self.records, self.pool):
+                    spill.seek(0)
+                    shutil.copyfileobj(spill, f)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            self.abort()
+
+    def abort(self):
+        """Drop the spill files without writing anything."""
+        self.records.close()
+        self.pool.close()
+
+
+def write_binary_db(items, path):
+    """Compile a list of emoji dicts into `path` (written atomically)."""
+    writer = BinaryDBWriter(path)
+    try:
+        for item in items:
+            writer.add(item)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+
+
+class BinaryEmojiDB:
+    """
+    Read-only, memory-mapped view of `emoji_data.bin`.
+
+    Opening only maps the file and decodes the string blob in one go;
+    `db[i]` decodes record i into the same dict `emoji_data.json` would
+    give. Each distinct string is sliced out once and then shared by all
+    the records using it.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("binary emoji DB is only supported on little-endian hosts")
+
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, string_count, blob_size, pool_len = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.mm.close()
+            raise ValueError(f"unsupported binary emoji DB: {path}")
+
+        self.view = view = memoryview(self.mm)
+        pos = HEADER.size
+        self.offsets = view[pos:pos + 4 * (string_count + 1)].cast("I")
+        pos += 4 * (string_count + 1)
+        self.text = self.mm[pos:pos + blob_size].decode("utf-8")
+        pos += blob_size
+        pos += -pos % 4
+        self.records_start = pos
+        pos += RECORD.size * count
+        self.pool = view[pos:pos + 4 * pool_len].cast("I")
+
+        self.count = count
+        self.cache = [None] * string_count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def string(self, idx):
+        """Decode string `idx` (cached, so equal strings are shared)."""
+        if idx == NONE:
+            return None
+        value = self.cache[idx]
+        if value is None:
+            value = self.text[self.offsets[idx]:self.offsets[idx + 1]]
+            self.cache[idx] = value
+        return value
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+
+        (char, codepoints, shortcode, category, flags, version,
+         names_off, keywords_off, extra_off, skin_tones_off, search_off) = RECORD.unpack_from(
+            self.mm, self.records_start + i * RECORD.size)
+
+        s = self.string
+        pool = self.pool
+        item = {"char": s(char)}
+        if codepoints != NONE:
+            item["codepoints"] = s(codepoints)
+        if shortcode != NONE:
+            item["shortcode"] = s(shortcode)
+
+        if names_off != NONE:
+            n = pool[names_off]
+            p = names_off + 1
+            item["names"] = {s(pool[p + 2 * k]): s(pool[p + 2 * k + 1]) for k in range(n)}
+
+        if keywords_off != NONE:
+            item["keywords"] = self.per_language(keywords_off)
+
+        if category != NONE:
+            item["category"] = s(category)
+        item["favorite"] = bool(flags & FLAG_FAVORITE)
+        item["version"] = None if version == NONE else version / 100
+
+        if extra_off != NONE:
+            n = pool[extra_off]
+            item["extra"] = [s(w) for w in pool[extra_off + 1:extra_off + 1 + n]]
+
+        if skin_tones_off != NONE:
+            n = pool[skin_tones_off]
+            item["skin_tones"] = [s(v) for v in pool[skin_tones_off + 1:skin_tones_off + 1 + n]]
+
+        if search_off != NONE:
+            item["search"] = self.per_language(search_off)
+
+        return item
+
+    def per_language(self, offset):
+        """Decode a `[count, lang, n, words...]` pool list into {lang: [words]}."""
+        s = self.string
+        pool = self.pool
+        lists = {}
+        p = offset + 1
+        for _ in range(pool[offset]):
+            n = pool[p + 1]
+            lists[s(pool[p])] = [s(w) for w in pool[p + 2:p + 2 + n]]
+            p += 2 + n
+        return lists
+
+    def close(self):
+        self.offsets.release()
+        self.pool.release()
+        self.view.release()
+        self.mm.close()
+
@@ -1,46 +1,99 @@
 #!/usr/bin/env python3
-import gi
-gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk, Gdk, GLib
+import sys
+import time
+
+PROCESS_START = time.perf_counter()
+
+if __name__ == "__main__":
+    # Command-line search (--query / --batch) never needs GTK
+    from geppemoji_query import is_query_mode
+    if is_query_mode(sys.argv[1:]):
+        from geppemoji_query import main
+        sys.exit(main(sys.argv[1:]))
+
+if __name__ == "__main__" and "--daemon" not in sys.argv[1:]:
+    # If a resident GeppEmoji (--daemon) is running, this invocation is just
+    # a tiny client asking it to show up. Do that before importing GTK.
+    from geppemoji_core import send_daemon_command, startup_timestamp
+    if "--stop-daemon" in sys.argv[1:]:
+        command = "quit"
+    else:
+        # Pass the launch timestamp on, so the window manager lets the
+        # daemon take the focus
+        command = f"show {startup_timestamp()}"
+    if send_daemon_command(command) or command == "quit":
+        sys.exit(0)
+
+from geppemoji_core import StartupProfiler
+
+# Startup phases are only timed with --profile-startup[=FILE.json]
+PROFILER = StartupProfiler.from_argv(
+    sys.argv[1:] if __name__ == "__main__" else [], PROCESS_START
+)
+
+with PROFILER.phase("import gi (Gtk, Gdk, GLib)"):
+    import gi
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import Gtk, Gdk, GLib
 
 import json
 import os
-import sys
-import locale
-import subprocess
-import re
-import zipfile
-from datetime import datetime
+import signal
+import threading
+from collections import OrderedDict
+
+from geppemoji_core import (
+    CategoryIndex,
+    FrecencyStore,
+    SearchIndex,
+    WriteBehind,
+    atomic_write_json,
+    daemon_socket_path,
+    diff_emoji_lists,
+    get_all_keywords,
+    get_display_name,
+    get_system_language,
+    merge_translations,
+    prepare_emoji_data,
+    read_favorites,
+    read_json_file,
+    set_custom_keywords,
+    file_stat_key,
+    toned_char,
+)
+
+PROFILER.mark("module imports done")
 
 APP_NAME = "GeppEmoji"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 EMOJI_FILE = os.path.join(BASE_DIR, "emoji_data.json")
+EMOJI_BIN_FILE = os.path.join(BASE_DIR, "emoji_data.bin")
+LANGUAGE_PACKS_DIR = os.path.join(BASE_DIR, "emoji_packs")
 RECENT_FILE = os.path.join(BASE_DIR, "emoji_recent.json")
 TRANSLATIONS_FILE = os.path.join(BASE_DIR, "emoji_translations.json")
 FAVORITES_FILE = os.path.join(BASE_DIR, "emoji_favorites.json")
 CONFIG_FILE = os.path.join(BASE_DIR, "config.json")
 LOCALES_DIR = os.path.join(BASE_DIR, "locales")
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "cache")
 EMOJI_TEST_URL = "https://unicode.org/Public/emoji/latest/emoji-test.txt"
 
+# Number of built tooltip strings kept around
+TOOLTIP_CACHE_SIZE = 256
+
+# Recents / favorites are written at most once per this delay (and at exit)
+PERSIST_FLUSH_DELAY_MS = 1500
+
 DEFAULT_CONFIG = {
     "theme": "system",          # "system", "light", "dark"
     "columns": 6,
     "max_recent": 40,
     "emoji_font_size": 22,
     "language": "system",       # "system" or "en"/"it"/"de"/...
+    "grid_mode": "flowbox",     # "flowbox", "virtual" or "drawn"
+    "max_emoji_version": 0,     # hide emoji newer than this (0 = show all)
     "debug": False
 }
 
-# Skin tone modifiers (empty = default)
-SKIN_TONES = [
-    "",                         # 0 = default (no modifier)
-    "\U0001F3FB",               # 1 = light
-    "\U0001F3FC",               # 2 = medium-light
-    "\U0001F3FD",               # 3 = medium
-    "\U0001F3FE",               # 4 = medium-dark
-    "\U0001F3FF",               # 5 = dark
-]
-
 # For preview buttons (hand with different tones)
 SKIN_TONE_PREVIEWS = [
     "🖐",      # default
@@ -53,6 +106,9 @@ SKIN_TONE_PREVIEWS = [
 
 # ---------------------------------------------------------------------
 # Default English UI strings (fallback if no locale file is found)
+#
+# Only the strings of the main window live here; those of dialogs and
+# menus opened later are in geppemoji_i18n.py, imported on first use.
 # ---------------------------------------------------------------------
 
 DEFAULT_I18N = {
@@ -70,98 +126,6 @@ DEFAULT_I18N = {
 
     "search.placeholder": "Search emoji...",
 
-    "instructions.title": "Instructions",
-    "instructions.body": (
-        "How to use GeppEmoji:\n\n"
-        "- On startup it shows the 'Recent' category and focuses the search entry.\n"
-        "- Choose a category or use 'Recent' to see your last used emoji.\n"
-        "- Type in the search box to filter emoji by name or keyword.\n\n"
-        "Mouse / Keyboard:\n"
-        "- Left click or Enter: insert the emoji (or accumulated emoji) and close.\n"
-        "- Shift + left click, right click or Shift + Enter: add the emoji to the buffer without closing.\n"
-        "- Middle click or Shift + T: edit custom keywords for the selected emoji.\n"
-        "- Ctrl + F: toggle favorite for the selected emoji.\n"
-        "- Esc: close the window without doing anything."
-    ),
-
-    "shortcuts.title": "Shortcuts",
-    "shortcuts.body": (
-        "Keyboard and mouse shortcuts in GeppEmoji:\n\n"
-        "- Arrow keys: move between emoji.\n"
-        "- Enter: insert and paste the current emoji (plus any emoji already in the buffer).\n"
-        "- Shift + Enter: add to buffer, do not paste.\n"
-        "- Left click: insert and paste.\n"
-        "- Shift + left click: add to buffer, do not paste.\n"
-        "- Right click: add to buffer, do not paste.\n"
-        "- Middle click: open the keyword editor for that emoji.\n"
-        "- Shift + T: open the keyword editor for the selected emoji.\n"
-        "- Ctrl + F: toggle favorite for the selected emoji.\n"
-        "- Esc: close the window."
-    ),
-
-    "about.title": "About",
-    "about.body": (
-        "{app_name}\n\n"
-        "Emoji picker with localized search, categories, favorites and recents.\n\n"
-        "Developed by Francesco Bianchi with the help of Geppetto AI."
-    ),
-
-    "update.title": "Update Emoji database",
-    "update.button.run": "Run import",
-    "update.heading": "How to update the Emoji database",
-    "update.step1": "1. Open the following link in your browser and save the file:",
-    "update.step2": (
-        "2. Save the file as <b>emoji-test.txt</b> into the application folder:\n"
-        "<tt>{base_dir}</tt>\n\n"
-        "3. After copying the file into the correct folder,\n"
-        "   press the button below to start the import process\n"
-        "   for the new Emoji into the app database."
-    ),
-    "update.error.title": "Update error",
-    "update.error.body": "Error while running build_emoji_db.py:\n{error}",
-    "update.success.title": "Updated",
-    "update.success.body": (
-        "Emoji database updated successfully.\n\n"
-        "New emoji should now be visible in the app."
-    ),
-
-    "editor.title": "Edit emoji keywords",
-    "editor.search_label": "Search key for emoji: {emoji}",
-    "editor.desc": "Add your own search keywords here, separated by a comma \",\"",
-    "editor.defaults_title": "Default keywords for {emoji} are:",
-    "editor.defaults.none": "(none)",
-
-    "msg.error.xdotool_activate": "Error using xdotool (windowactivate): {error}",
-    "msg.error.xdotool_key": "Error using xdotool (key ctrl+v): {error}",
-
-    # Preferences / config
-    "prefs.title": "Preferences",
-    "prefs.theme": "Theme",
-    "prefs.theme.system": "System",
-    "prefs.theme.light": "Light",
-    "prefs.theme.dark": "Dark",
-    "prefs.columns": "Columns",
-    "prefs.max_recent": "Max recent emoji",
-    "prefs.font_size": "Emoji font size",
-    "prefs.language": "Language",
-    "prefs.language.system": "System default",
-    "prefs.debug": "Enable debug log (also richer tooltips)",
-    "prefs.open_translations": "Open emoji_translations.json",
-    "prefs.open_config": "Open config.json",
-    "prefs.backup": "Create backup...",
-    "prefs.restore": "Restore backup...",
-
-    "prefs.backup_done_title": "Backup created",
-    "prefs.backup_done_body": "Backup saved as:\n{path}",
-    "prefs.backup_error_title": "Backup error",
-    "prefs.backup_error_body": "Error during backup:\n{error}",
-    "prefs.restore_done_title": "Backup restored",
-    "prefs.restore_done_body": "Backup restored.\nYou may need to restart GeppEmoji.",
-    "prefs.restore_error_title": "Restore error",
-    "prefs.restore_error_body": "Error during restore:\n{error}",
-    "prefs.language_changed_title": "Language changed",
-    "prefs.language_changed_body": "Language will be applied next time you start GeppEmoji.",
-
     # Status bar
     "status.results": "{count} emoji shown",
     "status.buffer": "Buffer: {buf}",
@@ -172,14 +136,6 @@ DEFAULT_I18N = {
 }
 
 
-def get_system_language():
-    """Return the system language (e.g. 'it', 'de', 'en')."""
-    lang, enc = locale.getdefaultlocale()
-    if lang:
-        return lang.split("_")[0]
-    return "en"
-
-
 def load_locale(lang):
     """
     Load UI translations from locales/<lang>.json.
@@ -222,8 +178,7 @@ def load_config():
 def save_config(cfg):
     """Save configuration to config.json."""
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, ensure_ascii=False, indent=2)
+        atomic_write_json(CONFIG_FILE, cfg, indent=2)
     except Exception as e:
         print(f"Error saving config.json: {e}", file=sys.stderr)
 
@@ -239,9 +194,727 @@ def escape_markup(text):
     )
 
 
+# ---------------------------------------------------------------------
+# Background work
+# ---------------------------------------------------------------------
+
+class BackgroundTask:
+    """
+    Run func() on a worker thread and hand the result to the GTK main loop.
+
+    on_done(result, error) is called once, through GLib.idle_add; func must
+    not touch any widget.
+    """
+
+    def __init__(self, name, func, on_done):
+        self.func = func
+        self.on_done = on_done
+        self.result = None
+        self.error = None
+        self.delivered = False
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            self.result = self.func()
+        except Exception as e:
+            self.error = e
+        GLib.idle_add(self.deliver)
+
+    def deliver(self):
+        if not self.delivered:
+            self.delivered = True
+            self.on_done(self.result, self.error)
+        return False
+
+    def wait(self):
+        """Block until func() is done and deliver its result right away."""
+        self.thread.join()
+        self.deliver()
+
+
+# ---------------------------------------------------------------------
+# Emoji grids
+# ---------------------------------------------------------------------
+#
+# The window only talks to its grid through this small interface:
+#
+#   set_items(items)        load the full emoji list (id = list position)
+#   set_visible_ids(ids, order=None)
+#                           show exactly these ids, in list order (or in
+#                           the order of the `order` list, e.g. Recent)
+#   visible_count()         number of emoji currently shown
+#   select_first()          select the first shown emoji
+#   get_selected_item()     selected item (selects the first one if needed)
+#   set_columns(n)          change the number of columns
+#   set_font_size(px)       change the emoji size
+#   update_items(items, id_map, changed)
+#                           switch to a new emoji list (after a DB update),
+#                           reusing the cells of the emoji still there
+#                           (id_map: old id -> new id); `changed` are the
+#                           new ids whose cells must be redrawn
+#   view_state()            (selected id or None, scroll position)
+#   restore_view(id, scroll)
+#                           select `id` (else the first emoji) and scroll back
+#   refresh_cells()         show the emoji again in the current skin tone
+#
+# Mouse clicks are forwarded to app.on_emoji_button_press(event, item).
+# Tooltips are built on demand: grids answer "query-tooltip" with
+# app.tooltip_for_item(item), so cells never carry tooltip text.
+
+
+class FlowBoxGrid(Gtk.ScrolledWindow):
+    """Classic grid: one FlowBoxChild + EventBox + Label per emoji."""
+
+    def __init__(self, app, columns):
+        Gtk.ScrolledWindow.__init__(self)
+        self.app = app
+        self.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+
+        self.flowbox = Gtk.FlowBox()
+        self.flowbox.set_max_children_per_line(int(columns))
+        self.flowbox.set_selection_mode(Gtk.SelectionMode.SINGLE)
+        self.flowbox.set_activate_on_single_click(False)
+        self.flowbox.set_row_spacing(0)
+        self.flowbox.set_column_spacing(0)
+        self.flowbox.set_valign(Gtk.Align.START)
+        self.flowbox.set_halign(Gtk.Align.FILL)
+        self.flowbox.set_has_tooltip(True)
+        self.flowbox.connect("query-tooltip", self.on_query_tooltip)
+        self.add(self.flowbox)
+
+        self.children = []
+        self.visible_ids = set()
+        self.moved = []     # ids moved to the front for an ordered view
+
+    def create_child(self, item):
+        """Create a FlowBoxChild with a compact cell."""
+        child = Gtk.FlowBoxChild()
+        child.set_size_request(32, 32)
+
+        event_box = Gtk.EventBox()
+        event_box.set_hexpand(False)
+        event_box.set_vexpand(False)
+        child.add(event_box)
+
+        display_char = self.app.get_toned_char(item) or "?"
+        emoji_label = Gtk.Label(label=display_char)
+
+        emoji_label.set_margin_top(0)
+        emoji_label.set_margin_bottom(0)
+        emoji_label.set_margin_start(0)
+        emoji_label.set_margin_end(0)
+
+        try:
+            emoji_label.set_xalign(0.5)
+            emoji_label.set_yalign(0.5)
+        except AttributeError:
+            emoji_label.set_alignment(0.5, 0.5)
+
+        emoji_label.get_style_context().add_class("emoji-label")
+
+        event_box.add(emoji_label)
+        event_box.add_events(Gdk.EventMask.BUTTON_PRESS_MASK)
+        event_box.connect("button-press-event", self.on_child_button_press, child)
+
+        child.item = item
+        return child
+
+    def set_items(self, items):
+        """Create one child per emoji; children[i] always shows items[i]."""
+        for child in self.children:
+            self.flowbox.remove(child)
+        self.children = []
+        for item in items:
+            child = self.create_child(item)
+            self.children.append(child)
+            self.flowbox.add(child)
+        self.flowbox.show_all()
+        self.visible_ids = set(range(len(self.children)))
+        self.moved = []
+
+    def update_items(self, items, id_map, changed):
+        """
+        Switch to `items` keeping the children of the emoji still there:
+        only the children of removed / added emoji are destroyed / created.
+        Added children stay hidden until the next set_visible_ids().
+        """
+        kept = sorted(id_map, key=id_map.get)     # old ids, in the new order
+        if any(a > b for a, b in zip(kept, kept[1:])):
+            # Emoji moved around: not worth patching
+            self.set_items(items)
+            return
+
+        self.restore_order()
+        old_children = self.children
+        children = [None] * len(items)
+        for old_id, child in enumerate(old_children):
+            new_id = id_map.get(old_id)
+            if new_id is None:
+                self.flowbox.remove(child)
+            else:
+                child.item = items[new_id]
+                children[new_id] = child
+
+        # Kept children are already in order: inserting the new ones at
+        # their index, first to last, puts every child in place
+        for new_id, child in enumerate(children):
+            if child is None:
+                child = children[new_id] = self.create_child(items[new_id])
+                child.show_all()
+                child.set_visible(False)
+                self.flowbox.insert(child, new_id)
+
+        for new_id in changed:
+            label = children[new_id].get_child().get_child()
+            label.set_text(self.app.get_toned_char(items[new_id]) or "?")
+
+        self.children = children
+        self.visible_ids = {id_map[i] for i in self.visible_ids if i in id_map}
+
+    def set_visible_ids(self, ids, order=None):
+        """
+        Show exactly the children in `ids`, touching only those that change.
+        With `order`, those children are moved to the front in that order
+        (only the moved ones are touched again when the view changes).
+        """
+        for item_id in self.visible_ids - ids:
+            self.children[item_id].set_visible(False)
+        for item_id in ids - self.visible_ids:
+            self.children[item_id].set_visible(True)
+        self.visible_ids = set(ids)
+
+        order = list(order) if order else []
+        if order != self.moved:
+            self.restore_order()
+            for pos, item_id in enumerate(order):
+                child = self.children[item_id]
+                self.flowbox.remove(child)
+                self.flowbox.insert(child, pos)
+            self.moved = order
+
+    def restore_order(self):
+        """Put the children moved by an ordered view back at their list position."""
+        for item_id in self.moved:
+            self.flowbox.remove(self.children[item_id])
+        for item_id in sorted(self.moved):
+            self.flowbox.insert(self.children[item_id], item_id)
+        self.moved = []
+
+    def first_visible_id(self):
+        if self.moved:
+            return self.moved[0]
+        return min(self.visible_ids)
+
+    def visible_count(self):
+        return len(self.visible_ids)
+
+    def select_first(self):
+        if self.visible_ids:
+            self.flowbox.select_child(self.children[self.first_visible_id()])
+        else:
+            self.flowbox.unselect_all()
+
+    def view_state(self):
+        selected = self.flowbox.get_selected_children()
+        item_id = self.children.index(selected[0]) if selected else None
+        return item_id, self.get_vadjustment().get_value()
+
+    def restore_view(self, item_id, scroll):
+        self.get_vadjustment().set_value(scroll)
+        if item_id in self.visible_ids:
+            self.flowbox.select_child(self.children[item_id])
+        else:
+            self.select_first()
+
+    def get_selected_item(self):
+        selected = self.flowbox.get_selected_children()
+        if selected:
+            return selected[0].item
+        if not self.visible_ids:
+            return None
+        self.select_first()
+        return self.children[self.first_visible_id()].item
+
+    def on_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        if keyboard_mode:
+            selected = self.flowbox.get_selected_children()
+            child = selected[0] if selected else None
+        else:
+            child = self.flowbox.get_child_at_pos(x, y)
+        if child is None:
+            return False
+        tooltip.set_text(self.app.tooltip_for_item(child.item))
+        return True
+
+    def refresh_cells(self):
+        """Relabel the children of emoji with skin-tone variants."""
+        for child in self.children:
+            if child.item.skin_tones:
+                label = child.get_child().get_child()
+                label.set_text(self.app.get_toned_char(child.item) or "?")
+
+    def set_columns(self, columns):
+        self.flowbox.set_max_children_per_line(int(columns))
+
+    def set_font_size(self, size):
+        """Nothing to do: the labels follow the emoji CSS."""
+
+    def on_child_button_press(self, widget, event, child):
+        self.flowbox.select_child(child)
+        return self.app.on_emoji_button_press(event, child.item)
+
+
+class VirtualEmojiGrid(Gtk.ScrolledWindow):
+    """
+    Virtualized grid: only the rows inside the viewport get a widget.
+
+    The cells are plain labels placed on a Gtk.Layout that is sized for the
+    whole result set. While scrolling, labels that leave the viewport are
+    rebound to the positions that enter it, so the number of widgets only
+    depends on the window size, not on the number of emoji.
+    """
+
+    def __init__(self, app, columns, font_size):
+        Gtk.ScrolledWindow.__init__(self)
+        self.app = app
+        self.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+
+        self.layout = Gtk.Layout()
+        self.layout.set_can_focus(True)
+        self.layout.add_events(Gdk.EventMask.BUTTON_PRESS_MASK)
+        self.layout.connect("button-press-event", self.on_button_press)
+        self.layout.connect("key-press-event", self.on_key_press)
+        self.layout.connect("size-allocate", self.on_size_allocate)
+        self.layout.set_has_tooltip(True)
+        self.layout.connect("query-tooltip", self.on_query_tooltip)
+        self.add(self.layout)
+        self.get_vadjustment().connect("value-changed", self.on_scroll)
+
+        self.items = []
+        self.shown = []             # item ids currently shown, in order
+        self.selected = -1          # position in self.shown
+        self.columns = max(1, int(columns))
+        self.cols = self.columns    # columns that fit the current width
+        self.cell_w = 1
+        self.cell_h = 1
+        self.width = 0
+
+        self.bound = {}             # position -> label showing it
+        self.spare = []             # labels ready to be reused
+
+        self.set_font_size(font_size)
+
+    # Geometry ----------------------------------------------------------
+
+    def set_font_size(self, size):
+        self.cell_h = max(32, int(int(size) * 1.6))
+        self.relayout()
+
+    def set_columns(self, columns):
+        self.columns = max(1, int(columns))
+        self.relayout()
+
+    def compute_geometry(self):
+        width = self.layout.get_allocated_width()
+        if width > 1:
+            self.cols = max(1, min(self.columns, width // self.cell_h))
+            self.cell_w = width // self.cols
+        else:
+            self.cols = self.columns
+            self.cell_w = self.cell_h
+        rows = (len(self.shown) + self.cols - 1) // self.cols
+        self.layout.set_size(max(width, 1), rows * self.cell_h)
+
+    def relayout(self):
+        """Recompute the geometry and move the bound labels accordingly."""
+        self.compute_geometry()
+        for pos, label in self.bound.items():
+            self.place(label, pos)
+        self.update_viewport()
+
+    def on_size_allocate(self, widget, allocation):
+        if allocation.width != self.width:
+            self.width = allocation.width
+            # Moving children from inside size-allocate would queue another
+            # resize; do it right after this layout pass instead.
+            GLib.idle_add(self.relayout_idle)
+
+    def relayout_idle(self):
+        self.relayout()
+        return False
+
+    def on_scroll(self, adjustment):
+        self.update_viewport()
+
+    def visible_range(self):
+        """Return the [start, end) positions of the rows in the viewport."""
+        vadj = self.get_vadjustment()
+        top = vadj.get_value()
+        height = vadj.get_page_size() or self.get_allocated_height()
+        first_row = int(top // self.cell_h)
+        last_row = int((top + height) // self.cell_h)
+        start = first_row * self.cols
+        end = min(len(self.shown), (last_row + 1) * self.cols)
+        return start, max(start, end)
+
+    def position_at(self, x, y):
+        """Return the position under content coordinates (x, y), or None."""
+        col = int(x // self.cell_w)
+        row = int(y // self.cell_h)
+        if col < 0 or col >= self.cols or row < 0:
+            return None
+        pos = row * self.cols + col
+        if pos >= len(self.shown):
+            return None
+        return pos
+
+    # Cells -------------------------------------------------------------
+
+    def new_label(self):
+        label = Gtk.Label()
+        label.set_xalign(0.5)
+        label.set_yalign(0.5)
+        label.set_no_show_all(True)
+        style = label.get_style_context()
+        style.add_class("emoji-label")
+        style.add_class("emoji-cell")
+        self.layout.put(label, 0, 0)
+        return label
+
+    def place(self, label, pos):
+        row, col = divmod(pos, self.cols)
+        label.set_size_request(self.cell_w, self.cell_h)
+        self.layout.move(label, col * self.cell_w, row * self.cell_h)
+
+    def bind(self, label, pos):
+        item = self.items[self.shown[pos]]
+        label.set_text(self.app.get_toned_char(item) or "?")
+        if pos == self.selected:
+            label.set_state_flags(Gtk.StateFlags.SELECTED, False)
+        else:
+            label.unset_state_flags(Gtk.StateFlags.SELECTED)
+        self.place(label, pos)
+        label.show()
+
+    def unbind_all(self):
+        for label in self.bound.values():
+            label.hide()
+            self.spare.append(label)
+        self.bound = {}
+
+    def update_viewport(self):
+        """Bind labels to the positions in the viewport, recycling the others."""
+        start, end = self.visible_range()
+        for pos in [p for p in self.bound if not start <= p < end]:
+            label = self.bound.pop(pos)
+            label.hide()
+            self.spare.append(label)
+        for pos in range(start, end):
+            if pos in self.bound:
+                continue
+            label = self.spare.pop() if self.spare else self.new_label()
+            self.bind(label, pos)
+            self.bound[pos] = label
+
+    # Grid interface ----------------------------------------------------
+
+    def set_items(self, items):
+        self.items = items
+        self.set_visible_ids(range(len(items)))
+
+    def update_items(self, items, id_map, changed):
+        # Cells only exist for the viewport: rebind them all
+        self.items = items
+        self.shown = [id_map[i] for i in self.shown if i in id_map]
+        self.selected = -1
+        self.unbind_all()
+        self.relayout()
+
+    def view_state(self):
+        item_id = self.shown[self.selected] if 0 <= self.selected < len(self.shown) else None
+        return item_id, self.get_vadjustment().get_value()
+
+    def restore_view(self, item_id, scroll):
+        self.get_vadjustment().set_value(scroll)
+        try:
+            pos = self.shown.index(item_id)
+        except ValueError:
+            pos = 0
+        self.select_position(pos)
+
+    def set_visible_ids(self, ids, order=None):
+        self.unbind_all()
+        self.shown = list(order) if order else sorted(ids)
+        self.selected = -1
+        self.get_vadjustment().set_value(0)
+        self.relayout()
+
+    def refresh_cells(self):
+        for pos, label in self.bound.items():
+            self.bind(label, pos)
+
+    def visible_count(self):
+        return len(self.shown)
+
+    def select_first(self):
+        self.select_position(0)
+
+    def get_selected_item(self):
+        if self.selected < 0:
+            self.select_first()
+        if self.selected < 0:
+            return None
+        return self.items[self.shown[self.selected]]
+
+    def on_query_tooltip(self, widget, x, y, keyboard_mode, tooltip):
+        top = self.get_vadjustment().get_value()
+        if keyboard_mode:
+            pos = self.selected if self.selected >= 0 else None
+        else:
+            # (x, y) are relative to the visible part of the layout
+            pos = self.position_at(x, y + top)
+        if pos is None:
+            return False
+        row, col = divmod(pos, self.cols)
+        area = Gdk.Rectangle()
+        area.x = col * self.cell_w
+        area.y = int(row * self.cell_h - top)
+        area.width = self.cell_w
+        area.height = self.cell_h
+        tooltip.set_tip_area(area)
+        tooltip.set_text(self.app.tooltip_for_item(self.items[self.shown[pos]]))
+        return True
+
+    # Selection / input -------------------------------------------------
+
+    def select_position(self, pos):
+        old = self.bound.get(self.selected)
+        if old is not None:
+            old.unset_state_flags(Gtk.StateFlags.SELECTED)
+
+        if not self.shown:
+            self.selected = -1
+            return
+
+        self.selected = max(0, min(pos, len(self.shown) - 1))
+        self.scroll_to(self.selected)
+        label = self.bound.get(self.selected)
+        if label is not None:
+            label.set_state_flags(Gtk.StateFlags.SELECTED, False)
+
+    def scroll_to(self, pos):
+        """Scroll just enough to make the row of `pos` fully visible."""
+        y = (pos // self.cols) * self.cell_h
+        vadj = self.get_vadjustment()
+        top = vadj.get_value()
+        page = vadj.get_page_size()
+        if y < top:
+            vadj.set_value(y)
+        elif page and y + self.cell_h > top + page:
+            vadj.set_value(y + self.cell_h - page)
+
+    def on_button_press(self, widget, event):
+        if event.type != Gdk.EventType.BUTTON_PRESS:
+            return False
+        # Labels have no window of their own, so clicks land on the layout's
+        # bin window, whose coordinates already include the scroll offset.
+        pos = self.position_at(event.x, event.y)
+        if pos is None:
+            return False
+        self.layout.grab_focus()
+        self.select_position(pos)
+        return self.app.on_emoji_button_press(event, self.items[self.shown[pos]])
+
+    def on_key_press(self, widget, event):
+        keyval = Gdk.keyval_name(event.keyval)
+        if keyval and keyval.startswith("KP_"):
+            keyval = keyval[3:]
+
+        rows_per_page = max(1, int(self.get_vadjustment().get_page_size() // self.cell_h))
+        steps = {
+            "Left": -1,
+            "Right": 1,
+            "Up": -self.cols,
+            "Down": self.cols,
+            "Page_Up": -self.cols * rows_per_page,
+            "Page_Down": self.cols * rows_per_page,
+        }
+
+        if keyval == "Home":
+            self.select_position(0)
+            return True
+        if keyval == "End":
+            self.select_position(len(self.shown) - 1)
+            return True
+        if keyval not in steps or not self.shown:
+            return False
+
+        current = max(self.selected, 0)
+        target = current + steps[keyval]
+        if keyval in ("Page_Up", "Page_Down"):
+            self.select_position(target)
+            return True
+        if 0 <= target < len(self.shown):
+            self.select_position(target)
+            return True
+        # Let GTK move the focus (e.g. Up from the first row to the search entry)
+        return False
+
+
+class DrawnEmojiGrid(VirtualEmojiGrid):
+    """
+    Custom-drawn grid: no widget per emoji at all.
+
+    Geometry, scrolling, keyboard navigation and tooltips are the ones of
+    VirtualEmojiGrid, but instead of labels a single DrawingArea, kept
+    pinned over the visible part of the layout, paints the cells from a
+    cache of pre-rendered glyph surfaces keyed by (char, size, scale).
+    Changing the font size or scrolling never re-lays out any widget.
+    """
+
+    GLYPH_CACHE_SIZE = 2048
+
+    def __init__(self, app, columns, font_size):
+        self.area = None
+        VirtualEmojiGrid.__init__(self, app, columns, font_size)
+        self.glyphs = OrderedDict()     # (char, size, scale) -> cairo surface
+        self.area = Gtk.DrawingArea()
+        self.area.connect("draw", self.on_draw)
+        self.layout.put(self.area, 0, 0)
+        self.area.show()
+        self.area_top = 0
+        self.connect("style-updated", self.on_style_updated)
+
+    def set_font_size(self, size):
+        self.font_size = int(size)
+        VirtualEmojiGrid.set_font_size(self, size)
+
+    def on_style_updated(self, widget):
+        # Text color / font may have changed: render the glyphs again
+        self.glyphs.clear()
+        self.queue_draw_cells()
+
+    # Painting ----------------------------------------------------------
+
+    def update_viewport(self):
+        """Keep the drawing area over the visible rows and repaint it."""
+        if self.area is None:
+            return
+        vadj = self.get_vadjustment()
+        self.area_top = int(vadj.get_value())
+        width = max(1, self.layout.get_allocated_width())
+        height = max(1, int(vadj.get_page_size() or self.get_allocated_height()))
+        self.area.set_size_request(width, height)
+        self.layout.move(self.area, 0, self.area_top)
+        self.queue_draw_cells()
+
+    def queue_draw_cells(self):
+        if self.area is not None:
+            self.area.queue_draw()
+
+    def unbind_all(self):
+        """Nothing is bound: cells are painted."""
+
+    def refresh_cells(self):
+        self.queue_draw_cells()
+
+    def glyph(self, char):
+        """Return the surface showing `char` in a cell_h x cell_h square."""
+        scale = self.get_scale_factor()
+        key = (char, self.font_size, scale)
+        surface = self.glyphs.get(key)
+        if surface is not None:
+            self.glyphs.move_to_end(key)
+            return surface
+
+        # Only this grid needs cairo / PangoCairo
+        import cairo
+        gi.require_version("PangoCairo", "1.0")
+        from gi.repository import Pango, PangoCairo
+
+        size = self.cell_h
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size * scale, size * scale)
+        surface.set_device_scale(scale, scale)
+        cr = cairo.Context(surface)
+
+        layout = PangoCairo.create_layout(cr)
+        font = self.get_pango_context().get_font_description().copy()
+        font.set_absolute_size(self.font_size * Pango.SCALE)
+        layout.set_font_description(font)
+        layout.set_text(char, -1)
+        _ink, logical = layout.get_pixel_extents()
+        cr.move_to((size - logical.width) / 2 - logical.x,
+                   (size - logical.height) / 2 - logical.y)
+        color = self.get_style_context().get_color(Gtk.StateFlags.NORMAL)
+        cr.set_source_rgba(color.red, color.green, color.blue, color.alpha)
+        PangoCairo.show_layout(cr, layout)
+        surface.flush()
+
+        self.glyphs[key] = surface
+        if len(self.glyphs) > self.GLYPH_CACHE_SIZE:
+            self.glyphs.popitem(last=False)
+        return surface
+
+    def on_draw(self, area, cr):
+        start, end = self.visible_range()
+        top = self.area_top
+        offset = (self.cell_w - self.cell_h) / 2
+
+        if start <= self.selected < end:
+            found, color = self.get_style_context().lookup_color("theme_selected_bg_color")
+            if found:
+                row, col = divmod(self.selected, self.cols)
+                cr.set_source_rgba(color.red, color.green, color.blue, color.alpha)
+                cr.rectangle(col * self.cell_w, row * self.cell_h - top, self.cell_w, self.cell_h)
+                cr.fill()
+
+        for pos in range(start, end):
+            item = self.items[self.shown[pos]]
+            row, col = divmod(pos, self.cols)
+            cr.set_source_surface(self.glyph(self.app.get_toned_char(item) or "?"),
+                                  col * self.cell_w + offset, row * self.cell_h - top)
+            cr.paint()
+        return True
+
+    # Selection / input -------------------------------------------------
+
+    def select_position(self, pos):
+        if not self.shown:
+            self.selected = -1
+        else:
+            self.selected = max(0, min(pos, len(self.shown) - 1))
+            self.scroll_to(self.selected)
+        self.queue_draw_cells()
+
+    def on_button_press(self, widget, event):
+        if event.type != Gdk.EventType.BUTTON_PRESS:
+            return False
+        # Presses may come from the drawing area's window (pinned at
+        # area_top) or from the layout's bin window (content coordinates).
+        y = event.y
+        if self.area is not None and event.window == self.area.get_window():
+            y += self.area_top
+        pos = self.position_at(event.x, y)
+        if pos is None:
+            return False
+        self.layout.grab_focus()
+        self.select_position(pos)
+        return self.app.on_emoji_button_press(event, self.items[self.shown[pos]])
+
+
 class GeppEmoji(Gtk.Window):
-    def __init__(self):
+    def __init__(self, daemon=False):
         Gtk.Window.__init__(self, title=APP_NAME)
+        # In daemon mode the window is hidden instead of closed, and shown
+        # again on request through the daemon socket.
+        self.daemon = daemon
+        self.daemon_socket = None
+        # Recents / favorites changes are batched and written later
+        self.persist = WriteBehind(
+            self.schedule_persist_flush, self.on_persist_error, self.on_persist_written
+        )
         self.set_default_size(460, 580)
         self.set_border_width(6)
         self.set_position(Gtk.WindowPosition.CENTER)
@@ -256,7 +929,16 @@ class GeppEmoji(Gtk.Window):
                 pass  # If it fails, just keep the default icon
 
         # Load configuration
-        self.config = load_config()
+        with PROFILER.phase("load_config"):
+            self.config = load_config()
+
+        # Window that had focus before GeppEmoji was opened: xdotool runs on
+        # a worker thread (the daemon captures it each time it shows up)
+        self.target_window = None
+        self.focus_task = None
+        if not daemon:
+            self.focus_task = BackgroundTask(
+                "focus-capture", self.get_previous_window_id, self.on_focus_captured)
 
         # Current skin tone index (0..5)
         self.current_skin_tone = 0
@@ -270,41 +952,43 @@ class GeppEmoji(Gtk.Window):
             self.language = system_lang
 
         # Load UI translations
-        self.i18n = load_locale(self.language)
-
-        # Load emoji translations/keyword families
-        self.translations = self.load_translations()
-
-        # Apply CSS for emoji (size etc.)
-        self.apply_emoji_css()
-
-        # Apply theme (light/dark/system)
-        self.apply_theme()
-
-        # Window that had focus before GeppEmoji was opened
-        self.target_window = self.get_previous_window_id()
-
-        # Load emoji list and apply translations
-        self.emoji_list = self.load_emoji_data()
-        self.apply_translations_to_emoji_list()
-
-        # Load favorites (persistent)
-        self.favorites_set = self.load_favorites()
-        self.apply_favorites_to_emoji_list()
+        with PROFILER.phase("load_locale"):
+            self.i18n = load_locale(self.language)
+
+        # Emoji data, translations and the search index are loaded on a
+        # worker thread while the window is built; until on_data_loaded()
+        # runs the grid is empty (typing is kept and applied then).
+        self.data_loaded = False
+        self.emoji_list = []
+        self.translations = {}                 # emoji_translations.json, edited in place
+        self.translations_stat = None          # its size/mtime when last read or written
+        self.default_keywords = {}             # (char, lang) -> keywords without the custom ones
+        self.keyword_edits = 0                 # bumped by every custom keywords edit
+        self.favorites_set = set()
+        self.search_index = None
+        self.category_index = CategoryIndex([])
+        self.tooltip_cache = OrderedDict()     # char -> tooltip text (LRU)
+        self.data_task = BackgroundTask("load-data", self.load_data, self.on_data_loaded)
+        self.update_process = None             # build_emoji_db.py run by "Update emoji DB"
+        self.update_pulse = None               # timeout pulsing its progress bar
+
+        # Apply CSS for emoji (size etc.) and theme (light/dark/system)
+        with PROFILER.phase("apply_emoji_css / apply_theme"):
+            self.apply_emoji_css()
+            self.apply_theme()
 
-        # Load recent list
-        self.recent_list = self.load_recent_list()
-        self.max_recent = int(self.config.get("max_recent", DEFAULT_CONFIG["max_recent"]))
-        self.recent_list = self.recent_list[: self.max_recent]
-        self.recent_set = set(self.recent_list)
+        # Recent emoji, ranked by frecency (tiny, read right away)
+        with PROFILER.phase("load recent"):
+            self.recent = self.load_recent()
 
         # Buffer for multi-emoji paste
         self.buffer_emojis = []
 
-        # Categories (All / Recent / Favorites / per category)
-        self.categories = self.collect_categories(self.emoji_list)
+        # Categories (All / Recent / Favorites, per category once loaded)
+        self.categories = self.collect_categories()
 
         # Main layout
+        PROFILER.begin("build window chrome")
         main_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
         self.add(main_vbox)
 
@@ -348,27 +1032,8 @@ class GeppEmoji(Gtk.Window):
 
         # Category combo (internal IDs + localized labels)
         self.category_combo = Gtk.ComboBoxText()
-        for cat in self.categories:
-            if cat == "All":
-                cat_id = "All"
-                label = self.tr("category.all")
-            elif cat == "Recent":
-                cat_id = "Recent"
-                label = self.tr("category.recent")
-            elif cat == "Favorites":
-                cat_id = "Favorites"
-                label = self.tr("category.favorites")
-            else:
-                cat_id = cat
-                label = cat
-            self.category_combo.append(cat_id, label)
-
-        if "Recent" in self.categories:
-            self.category_combo.set_active_id("Recent")
-        else:
-            self.category_combo.set_active(0)
-
         self.category_combo.connect("changed", self.on_filter_changed)
+        self.fill_category_combo()
         top_box.pack_start(self.category_combo, False, False, 0)
 
         # Search entry
@@ -378,27 +1043,18 @@ class GeppEmoji(Gtk.Window):
         self.search_entry.connect("activate", self.on_activate_first_visible)
         top_box.pack_start(self.search_entry, True, True, 0)
 
-        # FlowBox with emoji
-        self.flowbox = Gtk.FlowBox()
-        self.flowbox.set_max_children_per_line(int(self.config.get("columns", 6)))
-        self.flowbox.set_selection_mode(Gtk.SelectionMode.SINGLE)
-        self.flowbox.set_activate_on_single_click(False)
-        self.flowbox.set_row_spacing(0)
-        self.flowbox.set_column_spacing(0)
-        self.flowbox.set_valign(Gtk.Align.START)
-        self.flowbox.set_halign(Gtk.Align.FILL)
-
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scrolled.add(self.flowbox)
-        main_vbox.pack_start(scrolled, True, True, 0)
-
-        # Populate emojis
-        for item in self.emoji_list:
-            child = self.create_child(item)
-            self.flowbox.add(child)
-
-        self.flowbox.show_all()
+        # Emoji grid
+        columns = int(self.config.get("columns", 6))
+        grid_mode = self.config.get("grid_mode", "flowbox")
+        font_size = int(self.config.get("emoji_font_size", DEFAULT_CONFIG["emoji_font_size"]))
+        if grid_mode == "virtual":
+            self.grid = VirtualEmojiGrid(self, columns, font_size)
+        elif grid_mode == "drawn":
+            self.grid = DrawnEmojiGrid(self, columns, font_size)
+        else:
+            self.grid = FlowBoxGrid(self, columns)
+        main_vbox.pack_start(self.grid, True, True, 0)
+        PROFILER.end()
 
         # Skin tone selector bar
         self.create_skin_tone_bar(main_vbox)
@@ -408,14 +1064,22 @@ class GeppEmoji(Gtk.Window):
         self.status_label = Gtk.Label()
         self.status_label.set_xalign(0)
         status_box.pack_start(self.status_label, True, True, 0)
+
+        # Shown while "Update emoji DB" runs in the background
+        self.update_progress = Gtk.ProgressBar()
+        self.update_progress.set_show_text(True)
+        self.update_progress.set_no_show_all(True)
+        status_box.pack_end(self.update_progress, False, False, 0)
         main_vbox.pack_start(status_box, False, False, 0)
 
-        # Initial filter (Recent) and selection
-        GLib.idle_add(self.on_filter_changed, None)
-        GLib.idle_add(self.select_first_visible_emoji)
+        # The grid is populated (and first filtered) by on_data_loaded()
+        self.first_frame_drawn = False
+        if PROFILER.enabled:
+            self.connect("draw", self.on_first_draw)
 
         # Global key handling
         self.connect("key-press-event", self.on_key_press)
+        self.connect("delete-event", self.on_delete_event)
         self.connect("destroy", Gtk.main_quit)
 
     # -------------------------------------------------------------------------
@@ -424,7 +1088,12 @@ class GeppEmoji(Gtk.Window):
 
     def tr(self, key, **kwargs):
         """Translate a key using the loaded locale (with fallback)."""
-        text = self.i18n.get(key, DEFAULT_I18N.get(key, key))
+        text = self.i18n.get(key)
+        if text is None:
+            text = DEFAULT_I18N.get(key)
+        if text is None:
+            from geppemoji_i18n import DIALOG_I18N
+            text = DIALOG_I18N.get(key, key)
         if kwargs:
             try:
                 text = text.format(**kwargs)
@@ -441,8 +1110,100 @@ class GeppEmoji(Gtk.Window):
     # Data loading / helpers
     # -------------------------------------------------------------------------
 
+    def load_data(self):
+        """Load, merge and index the emoji data (runs on a worker thread: no GTK here)."""
+        translations_stat = file_stat_key(TRANSLATIONS_FILE)
+        data = prepare_emoji_data(
+            self.language, EMOJI_FILE, EMOJI_BIN_FILE, LANGUAGE_PACKS_DIR,
+            TRANSLATIONS_FILE, SNAPSHOT_DIR, log=self.log, profiler=PROFILER,
+        )
+        with PROFILER.phase("build category index"):
+            category_index = CategoryIndex(data.items)
+        return (data.translations, data.items, data.index, data.default_keywords,
+                category_index, translations_stat)
+
+    def on_data_loaded(self, result, error):
+        """Main loop: install the data loaded by load_data() and fill the grid."""
+        if error is not None:
+            print("Error loading emoji data:", error, file=sys.stderr)
+            result = ({}, [], SearchIndex([]), {}, CategoryIndex([]), None)
+        (self.translations, self.emoji_list, self.search_index, self.default_keywords,
+         category_index, self.translations_stat) = result
+
+        with PROFILER.phase("load favorites"):
+            self.favorites_set = self.load_favorites()
+            self.apply_favorites_to_emoji_list()
+        self.rebuild_category_index(category_index)
+
+        self.categories = self.collect_categories()
+        self.fill_category_combo()
+
+        with PROFILER.phase("grid.set_items (create cells)"):
+            self.grid.set_items(self.emoji_list)
+        self.data_loaded = True
+
+        self.initial_filter()
+        PROFILER.mark("grid populated")
+        self.maybe_report_startup_profile()
+
+    def on_focus_captured(self, window_id, error):
+        if self.target_window is None:
+            self.target_window = window_id
+
+    def category_label(self, cat):
+        """Label of a category in the combo (the special ones are translated)."""
+        if cat == "All":
+            return self.tr("category.all")
+        if cat == "Recent":
+            return self.tr("category.recent")
+        if cat == "Favorites":
+            return self.tr("category.favorites")
+        return cat
+
+    def fill_category_combo(self):
+        """(Re)fill the category combo from self.categories, keeping the selection."""
+        active_id = self.category_combo.get_active_id() or "Recent"
+        self.category_combo.handler_block_by_func(self.on_filter_changed)
+        self.category_combo.remove_all()
+        for cat in self.categories:
+            self.category_combo.append(cat, self.category_label(cat))
+
+        if active_id in self.categories:
+            self.category_combo.set_active_id(active_id)
+        else:
+            self.category_combo.set_active(0)
+        self.category_combo.handler_unblock_by_func(self.on_filter_changed)
+
+    def update_category_combo(self, categories):
+        """
+        Bring the category combo to `categories`, removing and inserting
+        only the entries that changed (the selection is kept if possible).
+        """
+        current = [cat for cat in self.categories if cat in categories]
+        if current != [cat for cat in categories if cat in current]:
+            # Order changed: refill
+            self.categories = categories
+            self.fill_category_combo()
+            return
+
+        combo = self.category_combo
+        active_id = combo.get_active_id()
+        combo.handler_block_by_func(self.on_filter_changed)
+        for pos in reversed(range(len(self.categories))):
+            if self.categories[pos] not in categories:
+                combo.remove(pos)
+        for pos, cat in enumerate(categories):
+            if pos >= len(current) or current[pos] != cat:
+                combo.insert(pos, cat, self.category_label(cat))
+                current.insert(pos, cat)
+        self.categories = categories
+        if active_id not in categories:
+            combo.set_active(0)
+        combo.handler_unblock_by_func(self.on_filter_changed)
+
     def get_previous_window_id(self):
         """Read the window that was focused before opening GeppEmoji."""
+        import subprocess   # on the worker thread, off the startup path
         try:
             out = subprocess.check_output(["xdotool", "getwindowfocus"], text=True)
             return out.strip()
@@ -452,217 +1213,112 @@ class GeppEmoji(Gtk.Window):
 
     def load_translations(self):
         """Load custom emoji translations/keywords from emoji_translations.json."""
-        if not os.path.exists(TRANSLATIONS_FILE):
-            return {}
-        try:
-            with open(TRANSLATIONS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, dict):
-                return {}
-            return data
-        except Exception as e:
-            self.log("Error loading emoji_translations.json:", e)
-            return {}
+        return read_json_file(TRANSLATIONS_FILE, dict, self.log) or {}
 
     def apply_translations_to_emoji_list(self):
         """Merge translations keywords (emoji_translations.json) into emoji_list items."""
-        if not getattr(self, "translations", None):
-            return
-
-        by_char = self.translations.get("by_char", {})
-        if not isinstance(by_char, dict):
-            return
-
-        for item in self.emoji_list:
-            ch = item.get("char")
-            if not ch or ch not in by_char:
-                continue
-
-            t = by_char[ch]
-            kw_dict = t.get("keywords", {})
-            if not isinstance(kw_dict, dict):
-                continue
-
-            base_kw = item.get("keywords")
-            if base_kw is None:
-                base_kw = {}
-                item["keywords"] = base_kw
-
-            if isinstance(base_kw, dict):
-                for lang, new_list in kw_dict.items():
-                    if not isinstance(new_list, list):
-                        continue
-                    old_list = base_kw.get(lang, [])
-                    if not isinstance(old_list, list):
-                        old_list = [str(old_list)]
-                    merged = sorted(set(old_list + new_list))
-                    base_kw[lang] = merged
-            elif isinstance(base_kw, list):
-                new_list = kw_dict.get(self.language, [])
-                if isinstance(new_list, list):
-                    merged = sorted(set(base_kw + new_list))
-                    item["keywords"] = merged
-
-    def normalize_skin_tones(self, data):
-        """
-        Collapse multiple skin-tone variants of the same base emoji into one.
-
-        Example: all skin-tone versions of a "thumbs up" become a single entry.
-        """
-        result = []
-        seen = set()
-
-        for item in data:
-            ch = item.get("char")
-            if not ch:
-                continue
-
-            base = self.strip_skin_tones(ch)
-
-            if base in seen:
-                continue
-
-            seen.add(base)
-            item["char"] = base
-            result.append(item)
-
-        return result
-
-    def load_emoji_data(self):
-        """Load emoji data from emoji_data.json and unify skin-tone variants."""
-        try:
-            with open(EMOJI_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            print("Errore caricando emoji_data.json:", e, file=sys.stderr)
-            data = []
-
-        for item in data:
-            if "favorite" not in item:
-                item["favorite"] = False
-            if "category" not in item:
-                item["category"] = "Other"
-
-        data = self.normalize_skin_tones(data)
-        return data
-
-    def load_recent_list(self):
-        """Load the last used emoji list from emoji_recent.json."""
-        if not os.path.exists(RECENT_FILE):
-            return []
-        try:
-            with open(RECENT_FILE, "r", encoding="utf-8") as f:
-                arr = json.load(f)
-            if isinstance(arr, list):
-                return arr
-        except Exception as e:
-            self.log("Error reading emoji_recent.json:", e)
-        return []
+        merge_translations(self.emoji_list, getattr(self, "translations", None), self.language,
+                           self.default_keywords)
+
+    def load_recent(self):
+        """Load the frecency store from emoji_recent.json (old plain lists too)."""
+        limit = int(self.config.get("max_recent", DEFAULT_CONFIG["max_recent"]))
+        data = None
+        if os.path.exists(RECENT_FILE):
+            try:
+                with open(RECENT_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                self.log("Error reading emoji_recent.json:", e)
+        return FrecencyStore.from_json(data, limit)
 
     def save_recent_list(self):
-        """Persist the recent emoji list to emoji_recent.json."""
-        try:
-            with open(RECENT_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.recent_list, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self.log("Error writing emoji_recent.json:", e)
+        """Mark emoji_recent.json dirty; it is written on the next flush."""
+        self.persist.mark_dirty(RECENT_FILE, self.recent.to_json, indent=2)
 
-    def update_recent(self, char):
-        """Update the recent emoji list with the newly used emoji."""
-        if not char:
+    def update_recent(self, *chars):
+        """Record a use of each emoji (in order) in the recent store."""
+        chars = [ch for ch in chars if ch]
+        if not chars:
             return
-        if char in self.recent_list:
-            self.recent_list.remove(char)
-        self.recent_list.insert(0, char)
-        if len(self.recent_list) > self.max_recent:
-            self.recent_list = self.recent_list[: self.max_recent]
-        self.recent_set = set(self.recent_list)
+        for char in chars:
+            self.recent.use(char)
+        self.category_index.set_recent(self.recent.ranked())
         self.save_recent_list()
-        self.log("Updated recent:", self.recent_list[:5], "...")
+        self.log("Updated recent:", self.recent.ranked()[:5], "...")
         self.update_status()
 
-    def collect_categories(self, data):
-        """Collect all categories and add All/Recent/Favorites."""
-        cats = set()
-        for item in data:
-            cat = item.get("category", "Other")
-            if cat:
-                cats.add(cat)
-        cat_list = sorted(cats)
+    def collect_categories(self):
+        """Collect all categories (from the category index) and add All/Recent/Favorites."""
+        cat_list = sorted(cat for cat in self.category_index.by_category if cat)
         return ["All", "Recent", "Favorites"] + cat_list
 
-    def clean_name(self, name):
-        """Remove prefixes such as 'e0.6 ' from the name."""
-        if not isinstance(name, str):
-            return ""
-        return re.sub(r"^e\d+(\.\d+)?\s+", "", name, flags=re.IGNORECASE)
-
     def get_display_name(self, item):
         """Return the display name based on the current language."""
-        names = item.get("names", {})
-        name = None
-        if isinstance(names, dict):
-            if self.language in names:
-                name = names[self.language]
-            elif "en" in names:
-                name = names["en"]
-        if not name:
-            name = item.get("shortcode", "")
-        return self.clean_name(name)
+        return get_display_name(item, self.language)
 
     def get_all_keywords(self, item):
         """Collect all keywords used for searching this emoji."""
-        keywords = []
-        kw = item.get("keywords", {})
+        return get_all_keywords(item, self.language)
 
-        if isinstance(kw, dict):
-            if self.language in kw:
-                keywords += kw[self.language]
-            if "en" in kw:
-                keywords += kw["en"]
-        elif isinstance(kw, list):
-            keywords += kw
+    def rebuild_search_index(self):
+        """Build the keyword search index for the current emoji_list and language."""
+        self.search_index = SearchIndex(
+            [self.get_all_keywords(item) for item in self.emoji_list]
+        )
+        self.log("Search index built:", len(self.search_index.keywords), "keywords")
 
-        extra = item.get("extra", [])
-        if isinstance(extra, list):
-            keywords += extra
+    def load_favorites(self):
+        """Load favorites from emoji_favorites.json or from emoji_data."""
+        return read_favorites(FAVORITES_FILE, self.emoji_list, self.log)
 
-        keywords.append(self.get_display_name(item))
+    def save_favorites(self):
+        """Mark emoji_favorites.json dirty; it is written on the next flush."""
+        self.persist.mark_dirty(FAVORITES_FILE, lambda: sorted(self.favorites_set), indent=2)
 
-        return [k.lower() for k in keywords if isinstance(k, str)]
+    # -------------------------------------------------------------------------
+    # Write-behind persistence
+    # -------------------------------------------------------------------------
 
-    def load_favorites(self):
-        """Load favorites from emoji_favorites.json or from emoji_data."""
-        if os.path.exists(FAVORITES_FILE):
-            try:
-                with open(FAVORITES_FILE, "r", encoding="utf-8") as f:
-                    arr = json.load(f)
-                if isinstance(arr, list):
-                    return set(arr)
-            except Exception as e:
-                self.log("Error reading emoji_favorites.json:", e)
+    def schedule_persist_flush(self, callback):
+        """Flush dirty files once the UI is idle, a short delay after the first change."""
+        GLib.timeout_add(PERSIST_FLUSH_DELAY_MS, callback, priority=GLib.PRIORITY_LOW)
 
-        favs = set()
-        for item in self.emoji_list:
-            if item.get("favorite"):
-                ch = item.get("char")
-                if ch:
-                    favs.add(ch)
-        return favs
+    def on_persist_error(self, path, error):
+        self.log(f"Error writing {os.path.basename(path)}:", error)
 
-    def save_favorites(self):
-        """Save current favorites set to emoji_favorites.json."""
-        try:
-            with open(FAVORITES_FILE, "w", encoding="utf-8") as f:
-                json.dump(sorted(self.favorites_set), f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self.log("Error writing emoji_favorites.json:", e)
+    def on_persist_written(self, path):
+        if path == TRANSLATIONS_FILE:
+            self.translations_stat = file_stat_key(path)
+
+    def save_translations(self):
+        """Mark emoji_translations.json dirty; it is written on the next flush."""
+        self.persist.mark_dirty(TRANSLATIONS_FILE, lambda: self.translations, indent=2)
+
+    def reload_translations_if_changed(self):
+        """Re-read emoji_translations.json only if it was changed outside the app."""
+        if self.persist.is_dirty(TRANSLATIONS_FILE):
+            return
+        stat = file_stat_key(TRANSLATIONS_FILE)
+        if stat != self.translations_stat:
+            self.log("emoji_translations.json changed on disk, reloading it")
+            self.translations = self.load_translations()
+            self.translations_stat = stat
+
+    def flush_persistence(self):
+        """Write pending recents/favorites now (called at exit and on hide)."""
+        self.persist.flush()
 
     def apply_favorites_to_emoji_list(self):
         """Apply favorites_set to emoji_list items."""
         for item in self.emoji_list:
-            ch = item.get("char")
-            item["favorite"] = bool(ch in self.favorites_set)
+            item.favorite = item.char in self.favorites_set
+
+    def rebuild_category_index(self, category_index=None):
+        """Install (or build) the category index and load Recent / Favorites into it."""
+        self.category_index = category_index or CategoryIndex(self.emoji_list)
+        self.category_index.set_recent(self.recent.ranked())
+        self.category_index.set_favorites(self.favorites_set)
 
     # -------------------------------------------------------------------------
     # CSS / theme
@@ -681,6 +1337,9 @@ class GeppEmoji(Gtk.Window):
             padding: 0;
             margin: 0;
         }}
+        label.emoji-cell:selected {{
+            background-color: @theme_selected_bg_color;
+        }}
         """
         provider = Gtk.CssProvider()
         provider.load_from_data(css.encode("utf-8"))
@@ -730,23 +1389,12 @@ class GeppEmoji(Gtk.Window):
     # Skin tone helpers
     # -------------------------------------------------------------------------
 
-    def strip_skin_tones(self, text):
-        """Remove any skin tone modifiers from a string."""
-        if not text:
-            return text
-        return "".join(ch for ch in text if ch not in SKIN_TONES[1:])
-
-    def apply_skin_tone_to_char(self, char):
+    def get_toned_char(self, item):
         """
-        Apply current skin tone modifier to a base emoji.
+        Return the emoji of `item` in the current skin tone (looked up in
+        its skin_tones table; emoji without variants are returned as is).
         """
-        if not char:
-            return char
-        base = self.strip_skin_tones(char)
-        tone_idx = self.current_skin_tone
-        if tone_idx <= 0 or tone_idx >= len(SKIN_TONES):
-            return base
-        return base + SKIN_TONES[tone_idx]
+        return toned_char(item, self.current_skin_tone)
 
     def create_skin_tone_bar(self, vbox):
         """Create the skin tone selector bar."""
@@ -780,6 +1428,7 @@ class GeppEmoji(Gtk.Window):
                 btn.set_active(False)
                 btn.handler_unblock_by_func(self.on_skin_tone_button_toggled)
 
+        self.grid.refresh_cells()
         self.log("Skin tone set to index:", idx)
 
     def on_menu_skin_tone(self, widget):
@@ -827,6 +1476,7 @@ class GeppEmoji(Gtk.Window):
                     btn.handler_block_by_func(self.on_skin_tone_button_toggled)
                     btn.set_active(i == self.current_skin_tone)
                     btn.handler_unblock_by_func(self.on_skin_tone_button_toggled)
+            self.grid.refresh_cells()
 
         dialog.destroy()
 
@@ -840,72 +1490,39 @@ class GeppEmoji(Gtk.Window):
         if not self.config.get("debug", False):
             return name
 
-        cat = item.get("category", "Other")
+        cat = item.category
         kws = self.get_all_keywords(item)
         kws = sorted(set(kws))[:8]
         parts = [name, f"({cat})"]
+        if item.version:
+            parts.append(f"version: {item.version:.1f}")
         if kws:
             parts.append("keywords: " + ", ".join(kws))
         return "\n".join(parts)
 
-    def update_all_tooltips(self):
-        """Rebuild tooltips for all emoji (e.g., after toggling debug)."""
-        for child in self.flowbox.get_children():
-            item = getattr(child, "item", None)
-            if not item:
-                continue
-            event_box = child.get_child()
-            tooltip = self.build_tooltip_for_item(item)
-            event_box.set_tooltip_text(tooltip)
-
-    def create_child(self, item):
-        """Create a FlowBoxChild with compact cell and tooltip."""
-        child = Gtk.FlowBoxChild()
-        child.set_size_request(32, 32)
-
-        event_box = Gtk.EventBox()
-        event_box.set_hexpand(False)
-        event_box.set_vexpand(False)
-        child.add(event_box)
-
-        base_char = item.get("char", "?")
-        display_char = self.apply_skin_tone_to_char(base_char)
-        emoji_label = Gtk.Label(label=display_char)
-
-        emoji_label.set_margin_top(0)
-        emoji_label.set_margin_bottom(0)
-        emoji_label.set_margin_start(0)
-        emoji_label.set_margin_end(0)
-
-        try:
-            emoji_label.set_xalign(0.5)
-            emoji_label.set_yalign(0.5)
-        except AttributeError:
-            emoji_label.set_alignment(0.5, 0.5)
-
-        emoji_label.get_style_context().add_class("emoji-label")
-
-        tooltip = self.build_tooltip_for_item(item)
-        event_box.set_tooltip_text(tooltip)
-
-        event_box.add(emoji_label)
-        event_box.add_events(Gdk.EventMask.BUTTON_PRESS_MASK)
-        event_box.connect(
-            "button-press-event",
-            self.on_emoji_button_press,
-            child,
-            item,
-        )
+    def tooltip_for_item(self, item):
+        """Return the tooltip of an emoji, from a small LRU of built strings."""
+        key = item.char
+        text = self.tooltip_cache.get(key)
+        if text is not None:
+            self.tooltip_cache.move_to_end(key)
+            return text
+        text = self.build_tooltip_for_item(item)
+        self.tooltip_cache[key] = text
+        if len(self.tooltip_cache) > TOOLTIP_CACHE_SIZE:
+            self.tooltip_cache.popitem(last=False)
+        return text
 
-        child.item = item
-        return child
+    def update_all_tooltips(self, item=None):
+        """Forget built tooltips (of one item, or all e.g. after toggling debug)."""
+        if item is None:
+            self.tooltip_cache.clear()
+        else:
+            self.tooltip_cache.pop(item.char, None)
 
     def select_first_visible_emoji(self):
         """Select the first visible emoji in the grid."""
-        for child in self.flowbox.get_children():
-            if child.get_visible():
-                self.flowbox.select_child(child)
-                break
+        self.grid.select_first()
 
     # -------------------------------------------------------------------------
     # Status bar
@@ -913,10 +1530,7 @@ class GeppEmoji(Gtk.Window):
 
     def update_status(self):
         """Update status bar with visible emoji count and buffer content."""
-        visible_count = 0
-        for child in self.flowbox.get_children():
-            if child.get_visible():
-                visible_count += 1
+        visible_count = self.grid.visible_count()
 
         text = self.tr("status.results", count=visible_count)
 
@@ -937,6 +1551,16 @@ class GeppEmoji(Gtk.Window):
         If there is search text, always search across ALL emoji,
         regardless of the selected category.
         """
+        if not self.data_loaded:
+            # on_data_loaded() filters with whatever was typed meanwhile
+            return
+
+        self.apply_filter()
+        self.select_first_visible_emoji()
+        self.update_status()
+
+    def apply_filter(self):
+        """Show the emoji matching the search text / category (selection untouched)."""
         text = self.search_entry.get_text().strip().lower()
         cat_id = self.category_combo.get_active_id()
 
@@ -947,48 +1571,32 @@ class GeppEmoji(Gtk.Window):
 
         self.log("Filter changed:", "text=", text, "cat_id=", cat_id, "effective=", effective_cat)
 
-        for child in self.flowbox.get_children():
-            item = getattr(child, "item", None)
-            if not item:
-                child.set_visible(False)
-                continue
+        if text:
+            ids = self.search_index.search(text)
+        else:
+            ids = self.category_index.ids_for(effective_cat)
 
-            if text:
-                keywords = self.get_all_keywords(item)
-                matches_text = any(text in kw for kw in keywords)
-            else:
-                matches_text = True
-
-            matches_cat = True
-            char = item.get("char", "")
-            favorite = item.get("favorite", False)
-            category = item.get("category", "Other")
-
-            if effective_cat == "Recent":
-                matches_cat = char in self.recent_set
-            elif effective_cat == "Favorites":
-                matches_cat = bool(favorite)
-            elif effective_cat == "All" or effective_cat is None:
-                matches_cat = True
-            else:
-                matches_cat = (category == effective_cat)
+        # Recent is shown best ranked first, everything else in list order
+        order = self.category_index.recent_order if effective_cat == "Recent" else None
 
-            visible = matches_text and matches_cat
-            child.set_visible(visible)
+        max_version = self.config.get("max_emoji_version", 0)
+        if max_version:
+            allowed = self.category_index.ids_up_to_version(max_version)
+            ids = ids & allowed
+            if order is not None:
+                order = [i for i in order if i in allowed]
 
-        self.select_first_visible_emoji()
-        self.update_status()
+        self.grid.set_visible_ids(ids, order)
+
+    def initial_filter(self):
+        """First filter pass (Recent), run once the main loop is up."""
+        with PROFILER.phase("first on_filter_changed"):
+            self.on_filter_changed(None)
+        return False
 
     def get_selected_item(self):
         """Return the currently selected emoji item, or the first visible one."""
-        selected = self.flowbox.get_selected_children()
-        if selected:
-            return selected[0].item
-        for child in self.flowbox.get_children():
-            if child.get_visible():
-                self.flowbox.select_child(child)
-                return child.item
-        return None
+        return self.grid.get_selected_item()
 
     def on_activate_first_visible(self, entry):
         """When pressing Enter in the search bar, use the current selection."""
@@ -1001,10 +1609,8 @@ class GeppEmoji(Gtk.Window):
     # Mouse handling
     # -------------------------------------------------------------------------
 
-    def on_emoji_button_press(self, widget, event, child, item):
-        """Handle left/middle/right mouse clicks on an emoji."""
-        self.flowbox.select_child(child)
-
+    def on_emoji_button_press(self, event, item):
+        """Handle left/middle/right mouse clicks on an emoji (already selected by the grid)."""
         state = event.state
         shift = bool(state & Gdk.ModifierType.SHIFT_MASK)
 
@@ -1036,7 +1642,7 @@ class GeppEmoji(Gtk.Window):
         ctrl = bool(state & Gdk.ModifierType.CONTROL_MASK)
 
         if keyval == "Escape":
-            Gtk.main_quit()
+            self.close_picker()
             return True
 
         if keyval in ("Return", "KP_Enter"):
@@ -1069,20 +1675,24 @@ class GeppEmoji(Gtk.Window):
 
     def toggle_favorite(self, item):
         """Toggle favorite flag for the given emoji and persist it."""
-        ch = item.get("char", "")
+        ch = item.char
         if not ch:
             return
         if ch in self.favorites_set:
             self.favorites_set.remove(ch)
-            item["favorite"] = False
+            item.favorite = False
             self.log("Removed from favorites:", ch)
         else:
             self.favorites_set.add(ch)
-            item["favorite"] = True
+            item.favorite = True
             self.log("Added to favorites:", ch)
+        self.category_index.set_favorite(ch, item.favorite)
 
         self.save_favorites()
-        self.on_filter_changed(None)
+        # Only the Favorites view (without search text) changes membership
+        if (self.category_combo.get_active_id() == "Favorites"
+                and not self.search_entry.get_text().strip()):
+            self.on_filter_changed(None)
 
     # -------------------------------------------------------------------------
     # Buffer logic and paste
@@ -1090,10 +1700,9 @@ class GeppEmoji(Gtk.Window):
 
     def add_to_buffer(self, item):
         """Add the emoji (with skin tone) to the buffer without pasting."""
-        raw_char = item.get("char", "")
-        if not raw_char:
+        char = self.get_toned_char(item)
+        if not char:
             return
-        char = self.apply_skin_tone_to_char(raw_char)
         self.buffer_emojis.append(char)
         self.update_recent(char)
         self.log("Buffer now:", "".join(self.buffer_emojis))
@@ -1101,14 +1710,13 @@ class GeppEmoji(Gtk.Window):
 
     def finalize_and_paste(self, item):
         """Add the emoji (with skin tone) to the buffer, paste everything, and close the app."""
-        raw_char = item.get("char", "")
-        if not raw_char:
+        char = self.get_toned_char(item)
+        if not char:
             return
 
-        char = self.apply_skin_tone_to_char(raw_char)
         self.buffer_emojis.append(char)
-        for ch in self.buffer_emojis:
-            self.update_recent(ch)
+        # The buffered emoji were recorded by add_to_buffer()
+        self.update_recent(char)
 
         text = "".join(self.buffer_emojis)
         self.log("Pasting text:", text)
@@ -1119,7 +1727,11 @@ class GeppEmoji(Gtk.Window):
         clipboard.set_text(text, -1)
         clipboard.store()
 
+        if self.focus_task is not None:
+            self.focus_task.wait()
+
         if self.target_window:
+            import subprocess
             try:
                 subprocess.call(
                     ["xdotool", "windowactivate", "--sync", self.target_window]
@@ -1131,7 +1743,21 @@ class GeppEmoji(Gtk.Window):
             except Exception as e:
                 self.log(self.tr("msg.error.xdotool_key", error=e))
 
-        Gtk.main_quit()
+        self.close_picker()
+
+    def close_picker(self):
+        """Quit the app, or just hide the window when running as a daemon."""
+        if self.daemon:
+            self.hide()
+            self.flush_persistence()
+        else:
+            Gtk.main_quit()
+
+    def on_delete_event(self, widget, event):
+        if self.daemon:
+            self.hide()
+            return True
+        return False
 
     # -------------------------------------------------------------------------
     # Custom keywords editor
@@ -1139,36 +1765,22 @@ class GeppEmoji(Gtk.Window):
 
     def open_keyword_editor(self, item):
         """Open a dialog to edit custom keywords for this emoji."""
-        char = item.get("char", "")
+        char = item.char
         if not char:
             return
 
         lang = self.language
 
-        if os.path.exists(TRANSLATIONS_FILE):
-            try:
-                with open(TRANSLATIONS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception:
-                data = {}
-        else:
-            data = {}
-
-        by_char = data.get("by_char", {})
+        self.reload_translations_if_changed()
+        by_char = self.translations.get("by_char", {})
         char_entry = by_char.get(char, {})
 
         kw_dict = char_entry.get("keywords", {})
         existing_personal = kw_dict.get(lang, [])
 
-        kw_main = item.get("keywords", {})
-        default_keywords = []
-        if isinstance(kw_main, dict):
-            if lang in kw_main:
-                default_keywords = kw_main[lang]
-            elif "en" in kw_main:
-                default_keywords = kw_main["en"]
-        elif isinstance(kw_main, list):
-            default_keywords = kw_main
+        default_keywords = self.default_keywords.get((char, lang), item.keywords.get(lang))
+        if default_keywords is None:
+            default_keywords = item.keywords.get("en", ())
 
         dialog = Gtk.Dialog(
             title=self.tr("editor.title"),
@@ -1245,34 +1857,33 @@ class GeppEmoji(Gtk.Window):
         if response == Gtk.ResponseType.OK:
             raw = entry.get_text()
             parts = [p.strip() for p in raw.split(",") if p.strip()]
+            self.set_custom_keywords(item, parts)
 
-            if "by_char" not in data:
-                data["by_char"] = {}
-            if char not in data["by_char"]:
-                data["by_char"][char] = {}
-            if "keywords" not in data["by_char"][char]:
-                data["by_char"][char]["keywords"] = {}
-            data["by_char"][char]["keywords"][lang] = parts
-
-            try:
-                with open(TRANSLATIONS_FILE, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                self.log("Error saving emoji_translations.json:", e)
+        dialog.destroy()
 
-            self.translations = data
+    def set_custom_keywords(self, item, parts):
+        """
+        Store the custom keywords of `item` for the current language and
+        apply them to that item only: its keywords, search index entry and
+        tooltip. emoji_translations.json is written on the next flush.
+        """
+        char = item.char
+        lang = self.language
 
-            if "keywords" not in item:
-                item["keywords"] = {}
-            existing_lang = item["keywords"].get(lang, [])
-            if not isinstance(existing_lang, list):
-                existing_lang = [str(existing_lang)]
-            merged = sorted(set(existing_lang + parts))
-            item["keywords"][lang] = merged
+        by_char = self.translations.setdefault("by_char", {})
+        kw_dict = by_char.setdefault(char, {}).setdefault("keywords", {})
+        kw_dict[lang] = parts
+        self.keyword_edits += 1
+        self.save_translations()
 
-            self.update_all_tooltips()
+        set_custom_keywords(item, lang, parts, self.default_keywords)
 
-        dialog.destroy()
+        item_id = self.category_index.id_by_char.get(char)
+        if self.search_index is not None and item_id is not None:
+            self.search_index.update_item(item_id, self.get_all_keywords(item))
+        else:
+            self.rebuild_search_index()
+        self.update_all_tooltips(item)
 
     # -------------------------------------------------------------------------
     # Menu actions: Instructions / Shortcuts / About / Update DB
@@ -1298,6 +1909,12 @@ class GeppEmoji(Gtk.Window):
 
     def on_menu_update_db(self, widget):
         """Show instructions and trigger build_emoji_db.py once emoji-test.txt is ready."""
+        if self.update_process is not None:
+            # Already running: its progress is in the status bar
+            return
+        if not self.data_loaded:
+            # Let the startup load finish first, it would overwrite the new data
+            self.data_task.wait()
         dialog = Gtk.Dialog(
             title=self.tr("update.title"),
             transient_for=self,
@@ -1350,11 +1967,19 @@ class GeppEmoji(Gtk.Window):
             return
 
         dialog.destroy()
+        self.start_db_update()
 
+    def start_db_update(self):
+        """
+        Run build_emoji_db.py as a subprocess, without blocking the window:
+        its --progress output feeds the progress bar, then the new data is
+        loaded on a worker thread and swapped in at once.
+        """
+        from gi.repository import Gio
         try:
-            subprocess.check_call(
-                [sys.executable, "build_emoji_db.py"],
-                cwd=BASE_DIR,
+            process = Gio.Subprocess.new(
+                [sys.executable, os.path.join(BASE_DIR, "build_emoji_db.py"), "--progress"],
+                Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_MERGE,
             )
         except Exception as e:
             self.show_message(
@@ -1364,48 +1989,139 @@ class GeppEmoji(Gtk.Window):
             )
             return
 
-        self.emoji_list = self.load_emoji_data()
-        self.apply_translations_to_emoji_list()
-        self.apply_favorites_to_emoji_list()
-        self.categories = self.collect_categories(self.emoji_list)
+        self.update_process = process
+        self.update_output = []         # last plain lines of output, for errors
+        self.update_rebuilt = True      # unless the builder says otherwise
+        self.update_progress.set_fraction(0.0)
+        self.update_progress.set_text(self.tr("update.stage.start"))
+        self.update_progress.show()
+
+        stream = Gio.DataInputStream.new(process.get_stdout_pipe())
+        stream.read_line_async(GLib.PRIORITY_DEFAULT, None, self.on_update_output)
 
+    def on_update_output(self, stream, result):
+        """One line of the builder's output (None at the end)."""
         try:
-            self.category_combo.disconnect_by_func(self.on_filter_changed)
-        except Exception:
-            pass
+            line, _length = stream.read_line_finish_utf8(result)
+        except Exception as e:
+            self.log("Error reading build_emoji_db.py output:", e)
+            line = None
 
-        self.category_combo.remove_all()
-        for cat in self.categories:
-            if cat == "All":
-                cat_id = "All"
-                label = self.tr("category.all")
-            elif cat == "Recent":
-                cat_id = "Recent"
-                label = self.tr("category.recent")
-            elif cat == "Favorites":
-                cat_id = "Favorites"
-                label = self.tr("category.favorites")
-            else:
-                cat_id = cat
-                label = cat
-            self.category_combo.append(cat_id, label)
+        if line is None:
+            self.update_process.wait_check_async(None, self.on_update_exited)
+            return
 
-        if "Recent" in self.categories:
-            self.category_combo.set_active_id("Recent")
+        self.show_update_progress(line)
+        stream.read_line_async(GLib.PRIORITY_DEFAULT, None, self.on_update_output)
+
+    def show_update_progress(self, line):
+        """Show a progress event ({"stage": ...}) or a message line of the builder."""
+        event = None
+        if line.startswith("{"):
+            try:
+                event = json.loads(line)
+            except ValueError:
+                pass
+        if not isinstance(event, dict):
+            self.log("build_emoji_db:", line)
+            if line.strip():
+                self.update_output = self.update_output[-4:] + [line]
+            return
+
+        stage = event.get("stage")
+        if stage == "done":
+            self.update_rebuilt = bool(event.get("rebuilt", True))
+            return
+        self.update_progress.set_text(self.tr(f"update.stage.{stage}"))
+        total = event.get("total") or 0
+        if total:
+            self.update_progress.set_fraction(min(1.0, event.get("done", 0) / total))
         else:
-            self.category_combo.set_active(0)
+            self.update_progress.pulse()
 
-        self.category_combo.connect("changed", self.on_filter_changed)
+    def on_update_exited(self, process, result):
+        """The builder is done: load its output off the main thread."""
+        try:
+            process.wait_check_finish(result)
+        except Exception as e:
+            self.finish_db_update()
+            self.show_message(
+                self.tr("update.error.title"),
+                self.tr("update.error.body", error="\n".join(self.update_output) or e),
+                Gtk.MessageType.ERROR,
+            )
+            return
 
-        for child in list(self.flowbox.get_children()):
-            self.flowbox.remove(child)
-        for item in self.emoji_list:
-            child = self.create_child(item)
-            self.flowbox.add(child)
-        self.flowbox.show_all()
+        if not self.update_rebuilt:
+            self.finish_db_update()
+            self.show_message(
+                self.tr("update.unchanged.title"),
+                self.tr("update.unchanged.body"),
+            )
+            return
 
-        self.on_filter_changed(None)
-        self.select_first_visible_emoji()
+        self.update_progress.set_text(self.tr("update.stage.load"))
+        self.update_pulse = GLib.timeout_add(100, self.pulse_update_progress)
+        # load_data() reads emoji_translations.json: write pending edits first
+        self.flush_persistence()
+        self.update_edits = self.keyword_edits
+        BackgroundTask("update-data", self.load_data, self.on_update_data_loaded)
+
+    def pulse_update_progress(self):
+        self.update_progress.pulse()
+        return True
+
+    def finish_db_update(self):
+        if self.update_pulse:
+            GLib.source_remove(self.update_pulse)
+            self.update_pulse = None
+        self.update_progress.hide()
+        self.update_process = None
+
+    def on_update_data_loaded(self, result, error):
+        """Main loop: swap the rebuilt data in, all at once."""
+        self.finish_db_update()
+        if error is not None:
+            self.show_message(
+                self.tr("update.error.title"),
+                self.tr("update.error.body", error=error),
+                Gtk.MessageType.ERROR,
+            )
+            return
+
+        (translations, emoji_list, search_index, default_keywords,
+         category_index, translations_stat) = result
+        old_list = self.emoji_list
+        selected_id, scroll = self.grid.view_state()
+
+        self.emoji_list = emoji_list
+        self.search_index = search_index
+        self.default_keywords = default_keywords
+        if self.keyword_edits != self.update_edits:
+            # Keywords edited while loading (maybe already written, so the
+            # translations read by load_data() can be stale): keep ours
+            self.apply_translations_to_emoji_list()
+            self.rebuild_search_index()
+        else:
+            self.translations = translations
+            self.translations_stat = translations_stat
+        self.apply_favorites_to_emoji_list()
+        self.rebuild_category_index(category_index)
+
+        # Only the emoji added, removed or changed by the update touch the
+        # grid; Recent / Favorites follow by char
+        id_map, added, removed, changed = diff_emoji_lists(old_list, self.emoji_list)
+        self.log("DB update:", len(added), "added,", len(removed), "removed,",
+                 len(changed), "changed")
+        self.update_category_combo(self.collect_categories())
+        self.grid.update_items(self.emoji_list, id_map, changed)
+        for old_id in removed:
+            self.update_all_tooltips(old_list[old_id])
+        for new_id in changed:
+            self.update_all_tooltips(self.emoji_list[new_id])
+
+        self.apply_filter()
+        self.grid.restore_view(id_map.get(selected_id), scroll)
         self.update_status()
 
         self.show_message(
@@ -1541,6 +2257,36 @@ class GeppEmoji(Gtk.Window):
 
         row += 1
 
+        label_grid = Gtk.Label(label=self.tr("prefs.grid_mode"))
+        label_grid.set_xalign(0)
+        grid.attach(label_grid, 0, row, 1, 1)
+
+        combo_grid = Gtk.ComboBoxText()
+        combo_grid.append("flowbox", self.tr("prefs.grid_mode.flowbox"))
+        combo_grid.append("virtual", self.tr("prefs.grid_mode.virtual"))
+        combo_grid.append("drawn", self.tr("prefs.grid_mode.drawn"))
+        current_grid = self.config.get("grid_mode", "flowbox")
+        if current_grid not in ("flowbox", "virtual", "drawn"):
+            current_grid = "flowbox"
+        combo_grid.set_active_id(current_grid)
+        grid.attach(combo_grid, 1, row, 1, 1)
+
+        row += 1
+
+        label_version = Gtk.Label(label=self.tr("prefs.max_version"))
+        label_version.set_xalign(0)
+        grid.attach(label_version, 0, row, 1, 1)
+
+        combo_version = Gtk.ComboBoxText()
+        combo_version.append("0", self.tr("prefs.max_version.all"))
+        for version in reversed(self.category_index.versions):
+            combo_version.append(f"{version:g}", f"{version:.1f}")
+        if not combo_version.set_active_id(f"{self.config.get('max_emoji_version', 0):g}"):
+            combo_version.set_active_id("0")
+        grid.attach(combo_version, 1, row, 1, 1)
+
+        row += 1
+
         check_debug = Gtk.CheckButton(label=self.tr("prefs.debug"))
         check_debug.set_active(bool(self.config.get("debug", False)))
         grid.attach(check_debug, 0, row, 2, 1)
@@ -1575,9 +2321,12 @@ class GeppEmoji(Gtk.Window):
             new_max_recent = spin_recent.get_value_as_int()
             new_font = spin_font.get_value_as_int()
             new_lang = combo_lang.get_active_id() or "system"
+            new_grid_mode = combo_grid.get_active_id() or "flowbox"
+            new_max_version = float(combo_version.get_active_id() or 0)
             new_debug = bool(check_debug.get_active())
 
             lang_before = self.config.get("language", "system")
+            grid_mode_before = self.config.get("grid_mode", "flowbox")
             debug_before = bool(self.config.get("debug", False))
 
             self.config["theme"] = new_theme
@@ -1585,16 +2334,19 @@ class GeppEmoji(Gtk.Window):
             self.config["max_recent"] = new_max_recent
             self.config["emoji_font_size"] = new_font
             self.config["language"] = new_lang
+            self.config["grid_mode"] = new_grid_mode
+            self.config["max_emoji_version"] = new_max_version
             self.config["debug"] = new_debug
 
             save_config(self.config)
 
-            self.max_recent = new_max_recent
-            self.recent_list = self.recent_list[: self.max_recent]
-            self.recent_set = set(self.recent_list)
-            self.save_recent_list()
+            if new_max_recent != self.recent.limit:
+                self.recent.set_limit(new_max_recent)
+                self.category_index.set_recent(self.recent.ranked())
+                self.save_recent_list()
 
-            self.flowbox.set_max_children_per_line(new_cols)
+            self.grid.set_columns(new_cols)
+            self.grid.set_font_size(new_font)
 
             self.apply_emoji_css()
             self.apply_theme()
@@ -1602,12 +2354,20 @@ class GeppEmoji(Gtk.Window):
             if new_debug != debug_before:
                 self.update_all_tooltips()
 
+            self.on_filter_changed()
+
             if new_lang != lang_before:
                 self.show_message(
                     self.tr("prefs.language_changed_title"),
                     self.tr("prefs.language_changed_body"),
                 )
 
+            if new_grid_mode != grid_mode_before:
+                self.show_message(
+                    self.tr("prefs.grid_mode_changed_title"),
+                    self.tr("prefs.grid_mode_changed_body"),
+                )
+
             self.update_status()
 
         dialog.destroy()
@@ -1625,6 +2385,7 @@ class GeppEmoji(Gtk.Window):
             except Exception as e:
                 self.show_message("Error", f"Cannot create file:\n{e}", Gtk.MessageType.ERROR)
                 return
+        import subprocess
         try:
             subprocess.Popen(["xdg-open", path])
         except Exception as e:
@@ -1649,6 +2410,13 @@ class GeppEmoji(Gtk.Window):
         folder = chooser.get_filename()
         chooser.destroy()
 
+        # Only needed here: not imported at startup
+        import zipfile
+        from datetime import datetime
+
+        # Include edits still waiting to be written
+        self.flush_persistence()
+
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         backup_name = f"geppemoji-backup-{timestamp}.zip"
         backup_path = os.path.join(folder, backup_name)
@@ -1700,6 +2468,11 @@ class GeppEmoji(Gtk.Window):
         zip_path = chooser.get_filename()
         chooser.destroy()
 
+        import zipfile
+
+        # Write pending edits now, so they cannot overwrite the restored files later
+        self.flush_persistence()
+
         try:
             with zipfile.ZipFile(zip_path, "r") as zf:
                 for name in ("emoji_recent.json", "emoji_translations.json", "config.json"):
@@ -1719,6 +2492,143 @@ class GeppEmoji(Gtk.Window):
                 Gtk.MessageType.ERROR,
             )
 
+    # -------------------------------------------------------------------------
+    # Startup profiling (--profile-startup)
+    # -------------------------------------------------------------------------
+
+    def on_first_draw(self, widget, cr):
+        """Mark the first frame, then report once the pending idle work is done."""
+        self.disconnect_by_func(self.on_first_draw)
+        PROFILER.mark("first frame drawn")
+        self.first_frame_drawn = True
+        self.maybe_report_startup_profile()
+        return False
+
+    def maybe_report_startup_profile(self):
+        """Report once both the first frame is drawn and the grid is populated."""
+        if PROFILER.enabled and self.first_frame_drawn and self.data_loaded:
+            GLib.idle_add(self.report_startup_profile, priority=GLib.PRIORITY_LOW)
+
+    def report_startup_profile(self):
+        PROFILER.report()
+        return False
+
+    # -------------------------------------------------------------------------
+    # Daemon mode
+    # -------------------------------------------------------------------------
+
+    def start_daemon_server(self):
+        """
+        Listen on the daemon socket; return False if another daemon is running.
+
+        If the socket cannot be set up, fall back to a normal window
+        (self.daemon is cleared).
+        """
+        import socket
+        path = daemon_socket_path()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            if os.path.exists(path):
+                try:
+                    sock.connect(path)
+                    sock.close()
+                    return False
+                except OSError:
+                    # Stale socket left behind by a crashed daemon
+                    os.unlink(path)
+                    sock.close()
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+            old_umask = os.umask(0o077)
+            try:
+                sock.bind(path)
+            finally:
+                os.umask(old_umask)
+            sock.listen(4)
+        except OSError as e:
+            sock.close()
+            self.log("Cannot listen on", path, f"({e}), running without a daemon")
+            self.daemon = False
+            self.focus_task = BackgroundTask(
+                "focus-capture", self.get_previous_window_id, self.on_focus_captured)
+            return True
+
+        self.daemon_socket = sock
+        GLib.io_add_watch(sock.fileno(), GLib.PRIORITY_DEFAULT, GLib.IO_IN, self.on_daemon_request)
+        self.log("Daemon listening on", path)
+        return True
+
+    def stop_daemon_server(self):
+        if self.daemon_socket is None:
+            return
+        self.daemon_socket.close()
+        self.daemon_socket = None
+        try:
+            os.unlink(daemon_socket_path())
+        except OSError:
+            pass
+
+    def on_daemon_request(self, fd, condition):
+        """Handle one client command ("show" / "quit") from the daemon socket."""
+        try:
+            conn, _ = self.daemon_socket.accept()
+        except OSError:
+            return True
+
+        with conn:
+            conn.settimeout(1.0)
+            try:
+                command = conn.recv(64).decode("utf-8", "replace").strip()
+                conn.sendall(b"ok\n")
+            except OSError as e:
+                self.log("Daemon client error:", e)
+                return True
+
+        self.log("Daemon command:", command)
+        command, _, timestamp = command.partition(" ")
+        if command == "show":
+            self.show_picker(int(timestamp) if timestamp.isdigit() else 0)
+        elif command == "quit":
+            Gtk.main_quit()
+        return True
+
+    def show_picker(self, timestamp=0):
+        """
+        Capture the focused window, reset search/buffer and present the window.
+
+        timestamp is the X time of the launch that asked for the picker (0 if
+        the client did not know it).
+        """
+        self.target_window = self.get_previous_window_id()
+
+        self.buffer_emojis = []
+        self.search_entry.set_text("")
+        if "Recent" in self.categories:
+            self.category_combo.set_active_id("Recent")
+        self.on_filter_changed(None)
+
+        self.present_with_time(timestamp or self.current_user_time())
+        self.search_entry.grab_focus()
+
+    def current_user_time(self):
+        """Return a timestamp for present_with_time() when the client had none."""
+        timestamp = Gtk.get_current_event_time()
+        if timestamp:
+            return timestamp
+        # Requests come from the socket, not from an input event: on X11 ask
+        # the server for its current time, so focus stealing prevention does
+        # not keep the window behind
+        try:
+            gi.require_version("GdkX11", "3.0")
+            from gi.repository import GdkX11
+            window = self.get_window()
+            if isinstance(window, GdkX11.X11Window):
+                return GdkX11.x11_get_server_time(window)
+        except (ImportError, ValueError) as e:
+            self.log("No X11 server time:", e)
+        return Gdk.CURRENT_TIME
+
     # -------------------------------------------------------------------------
     # Generic message dialog helper
     # -------------------------------------------------------------------------
@@ -1737,8 +2647,30 @@ class GeppEmoji(Gtk.Window):
 
 
 if __name__ == "__main__":
-    app = GeppEmoji()
-    app.show_all()
-    app.search_entry.grab_focus()
-    app.update_status()
-    Gtk.main()
+    with PROFILER.phase("GeppEmoji.__init__"):
+        app = GeppEmoji(daemon="--daemon" in sys.argv[1:])
+    if app.daemon and not app.start_daemon_server():
+        print("GeppEmoji daemon is already running.", file=sys.stderr)
+        sys.exit(1)
+    if app.daemon:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signum, Gtk.main_quit)
+        # Build and realize everything now, so showing up later is instant
+        with PROFILER.phase("realize hidden window"):
+            app.get_child().show_all()
+            app.realize()
+        try:
+            Gtk.main()
+        finally:
+            app.stop_daemon_server()
+            app.flush_persistence()
+    else:
+        # Plain window (also when --daemon could not open its socket)
+        with PROFILER.phase("show_all"):
+            app.show_all()
+            app.search_entry.grab_focus()
+            app.update_status()
+        try:
+            Gtk.main()
+        finally:
+            app.flush_persistence()
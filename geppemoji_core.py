@@ -0,0 +1,1301 @@
+"""
+GTK-free data and search helpers for GeppEmoji.
+
+Everything in this module works on plain emoji items (as loaded from
+`emoji_data.json`) and does not import `gi`, so it can be used headless.
+"""
+
+import bisect
+import heapq
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Skin tone modifiers (empty = default)
+SKIN_TONES = [
+    "",                         # 0 = default (no modifier)
+    "\U0001F3FB",               # 1 = light
+    "\U0001F3FC",               # 2 = medium-light
+    "\U0001F3FD",               # 3 = medium
+    "\U0001F3FE",               # 4 = medium-dark
+    "\U0001F3FF",               # 5 = dark
+]
+
+TONE_MODIFIERS = frozenset(SKIN_TONES[1:])
+VARIATION_SELECTOR_16 = "\uFE0F"
+
+
+# ---------------------------------------------------------------------
+# Data files
+# ---------------------------------------------------------------------
+
+def get_system_language():
+    """Return the system language (e.g. 'it', 'de', 'en')."""
+    import locale
+    lang, enc = locale.getdefaultlocale()
+    if lang:
+        return lang.split("_")[0]
+    return "en"
+
+
+def read_json_file(path, expected=dict, log=None):
+    """
+    Read a JSON file holding an `expected` (dict / list) value.
+    Return None if it is missing, unreadable or of another type.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        if log:
+            log(f"Error reading {os.path.basename(path)}:", e)
+        return None
+    return data if isinstance(data, expected) else None
+
+
+def read_emoji_data(json_path, bin_path, log=None):
+    """
+    Read the emoji items: the compiled `bin_path` if present and not older
+    than `json_path`, else `json_path`. Items get the default "favorite" /
+    "category" fields; skin-tone variants are not normalized yet.
+    """
+    data = None
+    if os.path.exists(bin_path):
+        if os.path.exists(json_path) and os.path.getmtime(bin_path) < os.path.getmtime(json_path):
+            if log:
+                log("emoji_data.bin is older than emoji_data.json, ignoring it")
+        else:
+            from emoji_db_binary import BinaryEmojiDB
+            try:
+                db = BinaryEmojiDB(bin_path)
+            except Exception as e:
+                if log:
+                    log("Error reading emoji_data.bin, falling back to JSON:", e)
+            else:
+                try:
+                    # Every record is needed (skin-tone normalization and
+                    # the search index walk them all), so decode them now
+                    data = list(db)
+                finally:
+                    db.close()
+
+    if data is None:
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print("Errore caricando emoji_data.json:", e, file=sys.stderr)
+            data = []
+
+    for item in data:
+        if "favorite" not in item:
+            item["favorite"] = False
+        if "category" not in item:
+            item["category"] = "Other"
+    return data
+
+
+def pack_languages(language):
+    """Languages whose names and keywords are loaded for `language` (plus English)."""
+    return tuple(dict.fromkeys((language, "en")))
+
+
+def language_pack_file(directory, language):
+    """Path of the names / keywords pack of `language` inside `directory`."""
+    safe = "".join(c for c in str(language) if c.isalnum() or c in "-_") or "default"
+    return os.path.join(directory, f"{safe}.json")
+
+
+def read_language_packs(directory, languages, log=None):
+    """
+    Read the packs of `languages` written by build_emoji_db.py: one
+    {char: {"name", "keywords", "search"}} dict per language. Missing or
+    unreadable packs are left out.
+    """
+    packs = {}
+    for lang in languages:
+        pack = read_json_file(language_pack_file(directory, lang), dict, log)
+        if pack:
+            packs[lang] = pack
+    return packs
+
+
+def read_favorites(path, emoji_list, log=None):
+    """Return the favorite chars from `path`, or from the items' "favorite" flags."""
+    arr = read_json_file(path, list, log)
+    if arr is not None:
+        return set(arr)
+    return {item.char for item in emoji_list if item.favorite and item.char}
+
+
+# ---------------------------------------------------------------------
+# Emoji data helpers
+# ---------------------------------------------------------------------
+
+def strip_skin_tones(text):
+    """Remove any skin tone modifiers from a string."""
+    if not text:
+        return text
+    return "".join(ch for ch in text if ch not in TONE_MODIFIERS)
+
+
+def skin_tone_index(char):
+    """
+    Return the skin tone (1..5, see SKIN_TONES) of a toned emoji, 0 if it
+    has no tone modifier, -1 if it mixes different tones.
+    """
+    found = {ch for ch in char if ch in TONE_MODIFIERS}
+    if not found:
+        return 0
+    if len(found) > 1:
+        return -1
+    return SKIN_TONES.index(found.pop())
+
+
+def skin_tone_key(char):
+    """The emoji without tone modifiers and VS16: the same for a base and its variants."""
+    return "".join(ch for ch in char if ch not in TONE_MODIFIERS and ch != VARIATION_SELECTOR_16)
+
+
+def add_skin_tone_variant(item, tone, char):
+    """Record `char` as the variant of `item` for skin tone `tone` (1..5)."""
+    tones = item.get("skin_tones")
+    if not isinstance(tones, list):
+        tones = item["skin_tones"] = [None] * (len(SKIN_TONES) - 1)
+    if tones[tone - 1] is None:
+        tones[tone - 1] = char
+
+
+def normalize_skin_tones(data):
+    """
+    Collapse multiple skin-tone variants of the same base emoji into one.
+
+    Example: all skin-tone versions of a "thumbs up" become a single entry.
+    Databases built by build_emoji_db.py already look like this (variants
+    are listed in item["skin_tones"]); for older ones the single-tone
+    variants are collected into that table here.
+    """
+    result = []
+    seen = set()
+    bases = {}      # skin_tone_key -> base item
+
+    for item in data:
+        ch = item.get("char")
+        if not ch:
+            continue
+
+        tone = skin_tone_index(ch)
+        if tone == 0:
+            if ch in seen:
+                continue
+            seen.add(ch)
+            bases.setdefault(skin_tone_key(ch), item)
+            result.append(item)
+            continue
+
+        key = skin_tone_key(ch)
+        base = bases.get(key)
+        if base is None:
+            # A variant without base entry: it becomes the base
+            base = dict(item, char=strip_skin_tones(ch))
+            if base["char"] in seen:
+                continue
+            seen.add(base["char"])
+            bases[key] = base
+            result.append(base)
+        if tone > 0:
+            add_skin_tone_variant(base, tone, ch)
+
+    return result
+
+
+def parse_version(token):
+    """Return the emoji version of a token like 'E13.1' as a float, or None."""
+    if len(token) < 2 or token[0] not in "eE":
+        return None
+    number = token[1:]
+    if not number.replace(".", "", 1).isdigit():
+        return None
+    return float(number)
+
+
+def split_version(name):
+    """Split a name like 'e1.0 grinning face' into ('grinning face', 1.0)."""
+    token, sep, rest = name.partition(" ")
+    version = parse_version(token) if sep else None
+    if version is None:
+        return name, None
+    return rest.lstrip(), version
+
+
+def search_keywords(names, keywords, extra, shortcode, language):
+    """
+    Lowercase search keywords of an emoji in `language`: its keywords in
+    that language and in English, the extra ones and its display name,
+    without duplicates.
+    """
+    name = names.get(language)
+    if name is None:
+        name = names.get("en")
+    if not name:
+        name = shortcode
+    words = list(keywords.get(language, ()))
+    words += keywords.get("en", ())
+    words += extra
+    words.append(name)
+    return list(dict.fromkeys(w.lower() for w in words))
+
+
+def upgrade_legacy_item(item):
+    """
+    Databases built before the "version" field carry the emoji version in
+    the names, shortcode and keywords ("e1.0 grinning face",
+    "e1_0_grinning_face", "e1.0"). Return a copy of `item` with it moved
+    into "version".
+    """
+    item = dict(item, version=None)
+
+    names = item.get("names")
+    if isinstance(names, dict):
+        item["names"] = names = dict(names)
+        for lang, name in names.items():
+            if isinstance(name, str):
+                names[lang], version = split_version(name)
+                if lang == "en":
+                    item["version"] = version
+
+    shortcode = item.get("shortcode")
+    if isinstance(shortcode, str):
+        # e1_0_grinning_face: the version takes the first two tokens
+        major, minor, rest = (shortcode.strip(":").split("_", 2) + ["", ""])[:3]
+        if rest and minor.isdigit() and parse_version(major) is not None:
+            item["shortcode"] = f":{rest}:" if shortcode.startswith(":") else rest
+
+    kw = item.get("keywords")
+    if isinstance(kw, dict):
+        item["keywords"] = {
+            lang: [w for w in words if not isinstance(w, str) or parse_version(w) is None]
+            if isinstance(words, list) else words
+            for lang, words in kw.items()
+        }
+    return item
+
+
+_VERSIONS = {}      # emoji version -> the float object shared by the records
+
+
+def _unpickle_emoji(char, codepoints, shortcode, category, names, keywords, extra,
+                    skin_tones, favorite, version_tenths, search):
+    return Emoji(char, codepoints, shortcode, category, names, keywords, extra,
+                 skin_tones, favorite, version_tenths / 10, search)
+
+
+class Emoji:
+    """
+    One emoji of the picker, as a compact record.
+
+    Built by emoji_records() from the emoji_data.json dicts once the
+    skin-tone variants are collapsed. Keywords are tuples per language;
+    language codes, categories, shortcodes and keywords are interned, so a
+    keyword used by many emoji is stored once. `search` holds the lowercase
+    search keywords per language precomputed by build_emoji_db.py (None if
+    there are none, so records without them share no empty dict); it is
+    dropped when the keywords change.
+
+    Only the languages in use are kept: from_dict() drops the others and
+    adds those of the language packs.
+    """
+
+    __slots__ = (
+        "char", "codepoints", "shortcode", "category", "names", "keywords",
+        "extra", "skin_tones", "favorite", "version", "search",
+    )
+
+    def __init__(self, char, codepoints=None, shortcode="", category="Other",
+                 names=None, keywords=None, extra=(), skin_tones=None, favorite=False,
+                 version=0.0, search=None):
+        self.char = char
+        self.codepoints = codepoints
+        self.shortcode = shortcode
+        self.category = category
+        self.names = names if names is not None else {}          # lang -> name
+        self.keywords = keywords if keywords is not None else {}  # lang -> tuple
+        self.extra = extra                  # language-independent keywords
+        self.skin_tones = skin_tones        # tuple of 5 variants (or None each), or None
+        self.favorite = favorite
+        # Emoji version, 0.0 if unknown; the few distinct values are shared
+        self.version = _VERSIONS.setdefault(version, version)
+        self.search = search or None        # lang -> tuple, or None
+
+    @classmethod
+    def from_dict(cls, item, languages=None, packs=None, intern=sys.intern):
+        """
+        Build a record from an emoji dict, keeping the names and keywords
+        of `languages` only (all if None) and adding those of `packs`
+        ({lang: pack}, see read_language_packs()).
+        """
+        def words(values):
+            return tuple(intern(w) for w in values if isinstance(w, str))
+
+        def per_language(value, kind, convert):
+            # {lang: value} of the wanted languages, values of type `kind` only
+            result = {}
+            if isinstance(value, dict):
+                for lang, v in value.items():
+                    if isinstance(v, kind) and (languages is None or lang in languages):
+                        result[intern(lang)] = convert(v)
+            return result
+
+        if "version" not in item:
+            item = upgrade_legacy_item(item)
+
+        names = per_language(item.get("names"), str, str)
+        keywords = per_language(item.get("keywords"), list, words)
+        search = per_language(item.get("search"), list, words)
+
+        extra = item.get("extra")
+        extra = words(extra) if isinstance(extra, list) else ()
+        kw = item.get("keywords")
+        if isinstance(kw, list):
+            # Old language-less lists are searched in every language, like extra
+            extra += words(kw)
+
+        char = item.get("char") or ""
+        for lang, pack in (packs or {}).items():
+            entry = pack.get(char)
+            if not isinstance(entry, dict):
+                continue
+            lang = intern(lang)
+            if isinstance(entry.get("name"), str):
+                names[lang] = entry["name"]
+            if isinstance(entry.get("keywords"), list):
+                keywords[lang] = words(entry["keywords"])
+            if isinstance(entry.get("search"), list):
+                search[lang] = words(entry["search"])
+
+        tones = item.get("skin_tones")
+        return cls(
+            char,
+            codepoints=item.get("codepoints"),
+            shortcode=intern(item.get("shortcode") or ""),
+            category=intern(item.get("category") or "Other"),
+            names=names,
+            keywords=keywords,
+            extra=extra,
+            skin_tones=tuple(tones) if isinstance(tones, list) else None,
+            favorite=bool(item.get("favorite")),
+            version=float(item.get("version") or 0.0),
+            search=search,
+        )
+
+    def astuple(self):
+        """All the fields, in constructor order."""
+        return (self.char, self.codepoints, self.shortcode, self.category, self.names,
+                self.keywords, self.extra, self.skin_tones, self.favorite,
+                self.version, self.search)
+
+    def __reduce__(self):
+        # Pickle as constructor arguments: loading a snapshot then builds no
+        # temporary per-record state dict. The version goes as tenths: small
+        # ints are shared, while a float would be allocated for every record.
+        fields = self.astuple()
+        return (_unpickle_emoji, fields[:9] + (round(fields[9] * 10),) + fields[10:])
+
+    def __repr__(self):
+        return f"Emoji({self.char!r}, {self.shortcode!r})"
+
+
+def emoji_records(data, languages=None, packs=None):
+    """
+    Turn emoji dicts (after normalize_skin_tones) into Emoji records, with
+    the names and keywords of `languages` (all if None) and `packs`.
+    """
+    return [Emoji.from_dict(item, languages, packs) for item in data]
+
+
+def diff_emoji_lists(old, new):
+    """
+    Compare two emoji lists by char (ids are list positions).
+
+    Return (id_map, added, removed, changed): id_map maps the old id of
+    every emoji in both lists to its new id, added / removed are the new /
+    old ids of the others, and changed the new ids of the emoji in both
+    whose data differ.
+    """
+    old_ids = {item.char: item_id for item_id, item in enumerate(old)}
+    id_map = {}
+    added = []
+    changed = []
+    for new_id, item in enumerate(new):
+        old_id = old_ids.pop(item.char, None)
+        if old_id is None:
+            added.append(new_id)
+            continue
+        id_map[old_id] = new_id
+        if old[old_id].astuple() != item.astuple():
+            changed.append(new_id)
+    removed = sorted(old_ids.values())
+    return id_map, added, removed, changed
+
+
+def toned_char(item, tone):
+    """Return the emoji of `item` with skin tone `tone` (0 = default), if it has one."""
+    return toned_variant(item.char, item.skin_tones, tone)
+
+
+def toned_variant(char, skin_tones, tone):
+    """Return `char` with skin tone `tone` from its `skin_tones` table, if it has one."""
+    if tone > 0 and skin_tones and tone <= len(skin_tones) and skin_tones[tone - 1]:
+        return skin_tones[tone - 1]
+    return char
+
+
+def merge_translations(emoji_list, translations, language, default_keywords=None):
+    """
+    Merge keywords from emoji_translations.json (`by_char`) into the items,
+    for `language` and English (the only ones searched).
+
+    If `default_keywords` is a dict, the keywords each item had before (its
+    defaults) are recorded in it by (char, lang), see set_custom_keywords().
+    """
+    if not translations:
+        return
+
+    by_char = translations.get("by_char", {})
+    if not isinstance(by_char, dict):
+        return
+
+    languages = pack_languages(language)
+    for item in emoji_list:
+        t = by_char.get(item.char)
+        if not isinstance(t, dict):
+            continue
+        kw_dict = t.get("keywords", {})
+        if not isinstance(kw_dict, dict):
+            continue
+
+        for lang, new_list in kw_dict.items():
+            if lang not in languages or not isinstance(new_list, list):
+                continue
+            old = item.keywords.get(lang, ())
+            if default_keywords is not None:
+                default_keywords.setdefault((item.char, lang), old)
+            merged = set(old)
+            merged.update(sys.intern(w) for w in new_list if isinstance(w, str))
+            if len(merged) != len(old):
+                item.keywords[sys.intern(lang)] = tuple(sorted(merged))
+                item.search = None
+
+
+def set_custom_keywords(item, language, keywords, default_keywords):
+    """
+    Make `keywords` the custom keywords of `item` in `language`: the item
+    keeps its default keywords (from `default_keywords`, filled by
+    merge_translations(); the current ones if it has none recorded) plus
+    these, so removing a custom keyword never drops a default one. The
+    precomputed search keywords of `language` are dropped with the old ones.
+    """
+    defaults = default_keywords.setdefault((item.char, language), item.keywords.get(language, ()))
+    merged = set(defaults)
+    merged.update(sys.intern(w) for w in keywords)
+    item.keywords[sys.intern(language)] = tuple(sorted(merged))
+    if item.search:
+        item.search.pop(language, None)
+
+
+def get_display_name(item, language):
+    """Return the display name of an emoji in `language` (English fallback)."""
+    names = item.names
+    name = names.get(language)
+    if name is None:
+        name = names.get("en")
+    if not name:
+        name = item.shortcode
+    return name
+
+
+def get_all_keywords(item, language):
+    """Collect all (lowercase) keywords used for searching this emoji."""
+    searches = item.search or {}
+    search = searches.get(language)
+    if search is None and language not in item.names and language not in item.keywords:
+        # Nothing specific to `language`: it searches like English
+        search = searches.get("en")
+    if search is None:
+        search = search_keywords(item.names, item.keywords, item.extra, item.shortcode, language)
+    return list(search)
+
+
+class CategoryIndex:
+    """
+    Item ids per category, computed once per emoji list, plus the live
+    Recent and Favorites id sets (kept up to date by the app), so that
+    switching category is a lookup instead of a scan of every item.
+    """
+
+    def __init__(self, emoji_list):
+        by_category = {}
+        self.id_by_char = {}        # char and each skin-tone variant -> item id
+        for item_id, item in enumerate(emoji_list):
+            by_category.setdefault(item.category, []).append(item_id)
+            if item.char:
+                self.id_by_char.setdefault(item.char, item_id)
+            for variant in item.skin_tones or ():
+                if variant:
+                    self.id_by_char.setdefault(variant, item_id)
+
+        self.by_category = {cat: frozenset(ids) for cat, ids in by_category.items()}
+        self.all_ids = frozenset(range(len(emoji_list)))
+
+        # Ids sorted by emoji version, for the "max emoji version" filter
+        self.version_order = sorted(range(len(emoji_list)), key=lambda i: emoji_list[i].version)
+        self.version_keys = [emoji_list[i].version for i in self.version_order]
+        self.versions = sorted(set(self.version_keys) - {0.0})
+        self.version_ids = {}       # max version -> frozenset of ids
+        self.recent_ids = frozenset()
+        self.recent_order = []      # recent ids, best ranked first
+        self.favorite_ids = set()
+
+    def ids_for(self, category):
+        """Return the ids shown for `category` when not searching."""
+        if category == "Recent":
+            return self.recent_ids
+        if category == "Favorites":
+            return frozenset(self.favorite_ids)
+        if category == "All" or category is None:
+            return self.all_ids
+        return self.by_category.get(category, frozenset())
+
+    def ids_up_to_version(self, version):
+        """
+        Return the ids of the emoji up to emoji `version` (all of them if
+        `version` is 0). Emoji of unknown version are always included.
+        """
+        if not version:
+            return self.all_ids
+        ids = self.version_ids.get(version)
+        if ids is None:
+            end = bisect.bisect_right(self.version_keys, version)
+            ids = self.version_ids[version] = frozenset(self.version_order[:end])
+        return ids
+
+    def set_recent(self, chars):
+        """
+        `chars` are the recent emoji, best first. They may be toned variants:
+        those count for their base emoji.
+        """
+        id_by_char = self.id_by_char
+        self.recent_order = list(dict.fromkeys(id_by_char[ch] for ch in chars if ch in id_by_char))
+        self.recent_ids = frozenset(self.recent_order)
+
+    def set_favorites(self, chars):
+        id_by_char = self.id_by_char
+        self.favorite_ids = {id_by_char[ch] for ch in chars if ch in id_by_char}
+
+    def set_favorite(self, char, favorite):
+        item_id = self.id_by_char.get(char)
+        if item_id is None:
+            return
+        if favorite:
+            self.favorite_ids.add(item_id)
+        else:
+            self.favorite_ids.discard(item_id)
+
+
+# ---------------------------------------------------------------------
+# Recent emoji (frecency)
+# ---------------------------------------------------------------------
+
+def _log2_add(a, b):
+    """log2(2**a + 2**b) without overflowing."""
+    if a < b:
+        a, b = b, a
+    return a + math.log2(1.0 + 2.0 ** (b - a))
+
+
+class FrecencyStore:
+    """
+    Recently used emoji ranked by "frecency": every use adds a weight that
+    halves every `half_life` seconds, so both how often and how lately an
+    emoji was used count.
+
+    Scores are stored as log2 of the weights measured from the epoch. That
+    orders entries exactly like the decayed sum would at any later time, so
+    a use is an O(1) update and nothing ever has to be decayed. A min-heap
+    (with lazy deletion) finds the entry to drop when the store goes over
+    `limit`; the ranked list is only re-sorted after a change.
+    """
+
+    HALF_LIFE = 3 * 24 * 3600
+
+    def __init__(self, limit, half_life=HALF_LIFE):
+        self.limit = max(0, int(limit))
+        self.half_life = half_life
+        self.entries = {}       # char -> [score, count, last use]
+        self.heap = []          # (score, char); stale once the score changed
+        self._ranked = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, char):
+        return char in self.entries
+
+    def use(self, char, when=None):
+        """Record one use of `char` (at time `when`, default now)."""
+        when = time.time() if when is None else when
+        weight = when / self.half_life
+        entry = self.entries.get(char)
+        if entry is None:
+            entry = self.entries[char] = [weight, 0, when]
+        else:
+            entry[0] = _log2_add(entry[0], weight)
+        entry[1] += 1
+        entry[2] = max(entry[2], when)
+        heapq.heappush(self.heap, (entry[0], char))
+        self._ranked = None
+        self._evict()
+
+    def set_limit(self, limit):
+        self.limit = max(0, int(limit))
+        self._evict()
+
+    def _evict(self):
+        entries = self.entries
+        while len(entries) > self.limit:
+            score, char = heapq.heappop(self.heap)
+            entry = entries.get(char)
+            if entry is not None and entry[0] == score:
+                del entries[char]
+                self._ranked = None
+        # drop the stale heap entries once they pile up
+        if len(self.heap) > 4 * max(len(entries), 16):
+            self.heap = [(entry[0], char) for char, entry in entries.items()]
+            heapq.heapify(self.heap)
+
+    def ranked(self):
+        """Return the chars, best ranked first."""
+        if self._ranked is None:
+            entries = self.entries
+            self._ranked = sorted(entries, key=lambda ch: entries[ch][0], reverse=True)
+        return self._ranked
+
+    def to_json(self):
+        return {
+            "version": 2,
+            "entries": [
+                {"char": ch, "score": self.entries[ch][0],
+                 "count": self.entries[ch][1], "last": self.entries[ch][2]}
+                for ch in self.ranked()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data, limit, now=None):
+        """
+        Load what to_json() wrote, or the old emoji_recent.json format (a
+        plain list, most recent first: replayed as one use a minute apart).
+        """
+        store = cls(limit)
+        if isinstance(data, list):
+            now = time.time() if now is None else now
+            chars = [ch for ch in data if isinstance(ch, str) and ch]
+            for age, ch in reversed(list(enumerate(chars))):
+                store.use(ch, now - 60 * age)
+            return store
+
+        if isinstance(data, dict):
+            for entry in data.get("entries", []):
+                try:
+                    ch = entry["char"]
+                    values = [float(entry["score"]), int(entry.get("count", 1)),
+                              float(entry.get("last", 0))]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if isinstance(ch, str) and ch and ch not in store.entries:
+                    store.entries[ch] = values
+                    store.heap.append((values[0], ch))
+            heapq.heapify(store.heap)
+            store._evict()
+        return store
+
+
+# ---------------------------------------------------------------------
+# Search index
+# ---------------------------------------------------------------------
+
+class SearchIndex:
+    """
+    Inverted trigram index over the search keywords of all emoji.
+
+    Items are identified by their position in the list passed to the
+    constructor. A query matches an item if it is a substring of any of
+    its keywords, exactly like a linear `text in kw` scan would.
+
+    The index works at the keyword level: every distinct keyword is stored
+    once, together with the ids of the items using it, and each of its
+    trigrams points back to it. Longer queries intersect the posting lists
+    of their trigrams and only verify the few surviving keywords; one- and
+    two-character queries scan the (much smaller) keyword vocabulary.
+
+    Results are cached per query. While typing, a query usually extends a
+    previous one ("hea" -> "hear"), and its matches can only be a subset of
+    that query's matches, so only those are re-tested; going back with
+    backspace hits the cache directly.
+    """
+
+    GRAM = 3
+    CACHE_SIZE = 64
+
+    def __init__(self, keywords_per_item):
+        """`keywords_per_item` is a list of lowercase keyword lists, one per item."""
+        self.size = len(keywords_per_item)
+        self.keywords = []          # keyword id -> keyword string
+        self.keyword_items = []     # keyword id -> set of item ids
+        self.grams = {}             # trigram -> list of keyword ids
+        self.haystacks = []         # item id -> its keywords joined by "\0"
+        self.cache = OrderedDict()  # query -> frozenset of item ids
+        self.last_query = ""
+        self.keyword_ids = {}       # keyword -> keyword id
+
+        keyword_ids = self.keyword_ids
+        for item_id, keywords in enumerate(keywords_per_item):
+            self.haystacks.append("\0".join(keywords))
+            for kw in keywords:
+                if not kw:
+                    continue
+                kw_id = keyword_ids.get(kw)
+                if kw_id is None:
+                    kw_id = len(self.keywords)
+                    keyword_ids[kw] = kw_id
+                    self.keywords.append(kw)
+                    self.keyword_items.append(set())
+                    self._index_keyword(kw, kw_id)
+                self.keyword_items[kw_id].add(item_id)
+
+        self.all_ids = frozenset(range(self.size))
+
+    def _keyword_id(self, kw):
+        """Return the id of keyword `kw`, indexing it if it is new."""
+        kw_id = self.keyword_ids.get(kw)
+        if kw_id is None:
+            kw_id = len(self.keywords)
+            self.keyword_ids[kw] = kw_id
+            self.keywords.append(kw)
+            self.keyword_items.append(set())
+            self._index_keyword(kw, kw_id)
+        return kw_id
+
+    def update_item(self, item_id, keywords):
+        """Replace the keywords of one item (e.g. after editing its custom keywords)."""
+        old = set(self.haystacks[item_id].split("\0")) - {""}
+        new = {kw for kw in keywords if kw}
+        for kw in old - new:
+            self.keyword_items[self._keyword_id(kw)].discard(item_id)
+        for kw in new - old:
+            self.keyword_items[self._keyword_id(kw)].add(item_id)
+        self.haystacks[item_id] = "\0".join(keywords)
+        self.clear_cache()
+
+    def _index_keyword(self, kw, kw_id):
+        grams = self.grams
+        n = self.GRAM
+        for gram in {kw[start:start + n] for start in range(len(kw) - n + 1)}:
+            grams.setdefault(gram, []).append(kw_id)
+
+    def matching_keywords(self, text):
+        """Return the ids of the keywords containing `text`."""
+        keywords = self.keywords
+        n = self.GRAM
+
+        if len(text) < n:
+            return [kw_id for kw_id, kw in enumerate(keywords) if text in kw]
+
+        # Intersect trigram posting lists, smallest first
+        postings = []
+        for start in range(len(text) - n + 1):
+            bucket = self.grams.get(text[start:start + n])
+            if not bucket:
+                return []
+            postings.append(bucket)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for bucket in postings[1:]:
+            candidates.intersection_update(bucket)
+            if not candidates:
+                return []
+
+        if len(text) == n:
+            return list(candidates)
+        return [kw_id for kw_id in candidates if text in keywords[kw_id]]
+
+    def search(self, text):
+        """Return the frozenset of item ids whose keywords contain `text`."""
+        if not text:
+            return self.all_ids
+
+        cached = self.cache.get(text)
+        if cached is not None:
+            self.cache.move_to_end(text)
+            self.last_query = text
+            return cached
+
+        base = self.narrowing_base(text)
+        if base is not None:
+            haystacks = self.haystacks
+            result = frozenset(i for i in base if text in haystacks[i])
+        else:
+            result = set()
+            keyword_items = self.keyword_items
+            for kw_id in self.matching_keywords(text):
+                result |= keyword_items[kw_id]
+            result = frozenset(result)
+
+        self.cache[text] = result
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        self.last_query = text
+        return result
+
+    def narrowing_base(self, text):
+        """
+        Return the smallest cached result of a query contained in `text`
+        (every match of `text` is also a match of it), or None.
+        """
+        if self.last_query and self.last_query in text:
+            best = self.cache.get(self.last_query)
+        else:
+            best = None
+        for query, ids in self.cache.items():
+            if (best is None or len(ids) < len(best)) and query in text:
+                best = ids
+        return best
+
+    def clear_cache(self):
+        """Forget cached results (call after changing the indexed keywords)."""
+        self.cache.clear()
+        self.last_query = ""
+
+
+# ---------------------------------------------------------------------
+# Warm-start snapshot
+# ---------------------------------------------------------------------
+
+def file_stat_key(path):
+    """Return (size, mtime_ns) of `path`, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def file_digest(path):
+    """Return a content hash of `path`, or None if it does not exist."""
+    import hashlib
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def snapshot_file(directory, language, producer="emoji"):
+    """
+    Path of the snapshot for `language` inside `directory`; each `producer`
+    (kind of snapshot data) gets its own file.
+    """
+    safe = "".join(c for c in str(language) if c.isalnum() or c in "-_") or "default"
+    return os.path.join(directory, f"{producer}-{safe}.pickle")
+
+
+class SnapshotCache:
+    """
+    Pickled copy of data prepared from some input files, reused while
+    they do not change.
+
+    A snapshot is valid for the same `key` (e.g. the language) if every
+    input still has the recorded size and mtime or, failing that, the
+    recorded content hash (so a touched or restored file does not
+    invalidate it). The data must be an instance of `kind`: anything else
+    (e.g. written by another producer) is a miss. Bump VERSION whenever the
+    pickled data changes shape.
+    """
+
+    VERSION = 8
+
+    def __init__(self, path, inputs, key, kind, log=None):
+        self.path = path
+        self.inputs = list(inputs)
+        self.key = key
+        self.kind = kind
+        self.log = log
+
+    def stamp(self):
+        """Fingerprint the inputs; take it *before* reading them, pass it to save()."""
+        return {path: (file_stat_key(path), file_digest(path)) for path in self.inputs}
+
+    def load(self):
+        """Return the snapshot data, or None if missing or stale."""
+        import pickle
+        try:
+            with open(self.path, "rb") as f:
+                snapshot = pickle.load(f)
+            if snapshot["version"] != self.VERSION or snapshot["key"] != self.key:
+                return None
+            stamp = snapshot["inputs"]
+            if not isinstance(snapshot["data"], self.kind):
+                if self.log:
+                    self.log("Ignoring snapshot of another kind:", type(snapshot["data"]).__name__)
+                return None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            if self.log:
+                self.log("Ignoring unreadable snapshot:", e)
+            return None
+
+        if sorted(stamp) != sorted(self.inputs):
+            return None
+        touched = False
+        for path, (stat_key, digest) in stamp.items():
+            if file_stat_key(path) == stat_key:
+                continue
+            if file_digest(path) != digest:
+                if self.log:
+                    self.log(f"Snapshot is stale: {os.path.basename(path)} changed")
+                return None
+            touched = True
+        if touched:
+            # Same content, new mtime: record it so the next start skips hashing
+            self.save(snapshot["data"], self.stamp())
+        return snapshot["data"]
+
+    def save(self, data, stamp):
+        """Store `data` prepared from the inputs as they were at `stamp`."""
+        import pickle
+        import tempfile
+        if stamp != self.stamp():
+            # An input changed while we were reading it: do not record a mix
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".snapshot.", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(
+                        {"version": self.VERSION, "key": self.key, "inputs": stamp, "data": data},
+                        f, protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            if self.log:
+                self.log("Error writing snapshot:", e)
+
+
+# ---------------------------------------------------------------------
+# Prepared emoji data (picker and --query)
+# ---------------------------------------------------------------------
+
+class EmojiData:
+    """
+    The emoji of one language, ready to show and search: the Emoji records
+    merged with the custom keywords of `translations`, their SearchIndex,
+    and the keywords each had before the custom ones (see merge_translations()).
+    """
+
+    def __init__(self, translations, items, index, default_keywords):
+        self.translations = translations
+        self.items = items
+        self.index = index
+        self.default_keywords = default_keywords
+
+
+def emoji_data_inputs(language, emoji_file, bin_file, packs_dir, translations_file):
+    """The files the emoji data of `language` is prepared from (for snapshots)."""
+    return ([emoji_file, bin_file, translations_file]
+            + [language_pack_file(packs_dir, lang) for lang in pack_languages(language)])
+
+
+def prepare_emoji_data(language, emoji_file, bin_file, packs_dir, translations_file,
+                       snapshot_dir, log=None, profiler=None):
+    """
+    Read the emoji data of `language`, merge the custom keywords and index
+    them; return an EmojiData. The result is kept in a warm-start snapshot
+    in `snapshot_dir`, valid while the input files and the language stay
+    the same. Both the picker and --query load their data through here.
+    """
+    profiler = profiler or StartupProfiler()
+    languages = pack_languages(language)
+    snapshot = SnapshotCache(
+        snapshot_file(snapshot_dir, language),
+        emoji_data_inputs(language, emoji_file, bin_file, packs_dir, translations_file),
+        language,
+        EmojiData,
+        log=log,
+    )
+    with profiler.phase("load snapshot"):
+        data = snapshot.load()
+    if data is not None:
+        return data
+
+    stamp = snapshot.stamp()
+    with profiler.phase("load_translations"):
+        translations = read_json_file(translations_file, dict, log) or {}
+    with profiler.phase("load_emoji_data"):
+        raw = read_emoji_data(emoji_file, bin_file, log)
+        with profiler.phase("normalize_skin_tones"):
+            raw = normalize_skin_tones(raw)
+        with profiler.phase("read_language_packs"):
+            packs = read_language_packs(packs_dir, languages, log)
+        with profiler.phase("emoji_records"):
+            items = emoji_records(raw, languages, packs)
+    with profiler.phase("apply_translations_to_emoji_list"):
+        default_keywords = {}
+        merge_translations(items, translations, language, default_keywords)
+    with profiler.phase("rebuild_search_index"):
+        index = SearchIndex([get_all_keywords(item, language) for item in items])
+
+    data = EmojiData(translations, items, index, default_keywords)
+    with profiler.phase("save snapshot"):
+        snapshot.save(data, stamp)
+    return data
+
+
+# ---------------------------------------------------------------------
+# Write-behind persistence
+# ---------------------------------------------------------------------
+
+def atomic_write_json(path, data, indent=None):
+    """Write `data` as JSON to a temp file next to `path`, then rename it over."""
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehind:
+    """
+    Coalesce JSON file writes.
+
+    `mark_dirty(path, snapshot)` only remembers that `path` needs writing;
+    `snapshot()` is called at flush time, so however many changes happen in
+    between, each file is written once with the latest state. `schedule`, if
+    given, is called with a callback the first time something becomes dirty
+    (the app hooks it to a GLib timeout); `flush()` must also be called at
+    exit. `on_written(path)`, if given, is called after each successful write.
+    """
+
+    def __init__(self, schedule=None, on_error=None, on_written=None):
+        self.schedule = schedule
+        self.on_error = on_error
+        self.on_written = on_written
+        self.pending = OrderedDict()    # path -> (snapshot, indent)
+        self.scheduled = False
+
+    def mark_dirty(self, path, snapshot, indent=None):
+        self.pending[path] = (snapshot, indent)
+        if self.schedule is not None and not self.scheduled:
+            self.scheduled = True
+            self.schedule(self.on_scheduled)
+
+    def is_dirty(self, path):
+        return path in self.pending
+
+    def on_scheduled(self):
+        self.scheduled = False
+        self.flush()
+        return False
+
+    def flush(self):
+        """Write every dirty file now."""
+        while self.pending:
+            path, (snapshot, indent) = self.pending.popitem(last=False)
+            try:
+                atomic_write_json(path, snapshot(), indent)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(path, e)
+                else:
+                    print(f"Error writing {path}: {e}", file=sys.stderr)
+            else:
+                if self.on_written is not None:
+                    self.on_written(path)
+
+
+# ---------------------------------------------------------------------
+# Daemon socket (resident mode)
+# ---------------------------------------------------------------------
+
+def daemon_socket_path():
+    """Return the path of the Unix socket used by `geppemoji.py --daemon`."""
+    import tempfile
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"geppemoji-{os.getuid()}.sock")
+
+
+def startup_timestamp(environ=None):
+    """Return the X timestamp of the launch that started us (0 if unknown)."""
+    # Launchers following the startup-notification spec end the id with _TIME<ts>
+    startup_id = (os.environ if environ is None else environ).get("DESKTOP_STARTUP_ID", "")
+    _, found, timestamp = startup_id.rpartition("_TIME")
+    return int(timestamp) if found and timestamp.isdigit() else 0
+
+
+def send_daemon_command(command, timeout=1.0):
+    """
+    Send a one-line command ("show [TIMESTAMP]", "quit") to a running daemon.
+
+    Return True if a daemon answered, False if none is running.
+    """
+    path = daemon_socket_path()
+    if not os.path.exists(path):
+        return False
+
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+        sock.sendall(command.encode("utf-8") + b"\n")
+        reply = sock.recv(64)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return reply.startswith(b"ok")
+
+
+# ---------------------------------------------------------------------
+# Startup profiler (--profile-startup)
+# ---------------------------------------------------------------------
+
+class StartupProfiler:
+    """
+    Time named startup phases, relative to process start.
+
+    Disabled profilers cost next to nothing, so phases can stay in the code.
+    Phases may be nested; the report indents them by depth. Use the
+    `phase()` context manager, or `begin()`/`end()` around longer spans.
+    Phases timed on worker threads are nested per thread and tagged with
+    the thread name.
+    """
+
+    def __init__(self, enabled=False, output=None, start=None):
+        self.enabled = enabled
+        self.output = output        # JSON file path, or None for stderr
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []            # [name, start offset, duration, depth]
+        self.open = {}              # thread id -> phases begun and not yet ended
+        self.reported = False
+
+    @classmethod
+    def from_argv(cls, argv, start=None):
+        """Build a profiler from `--profile-startup[=FILE.json]` in argv."""
+        for arg in argv:
+            if arg == "--profile-startup":
+                return cls(True, None, start)
+            if arg.startswith("--profile-startup="):
+                return cls(True, arg.split("=", 1)[1] or None, start)
+        return cls(False, None, start)
+
+    def _open_stack(self):
+        return self.open.setdefault(threading.get_ident(), [])
+
+    def _label(self, name):
+        thread = threading.current_thread()
+        if thread is threading.main_thread():
+            return name
+        return f"{name} [{thread.name}]"
+
+    def begin(self, name):
+        if not self.enabled:
+            return
+        stack = self._open_stack()
+        entry = [self._label(name), time.perf_counter() - self.start, 0.0, len(stack)]
+        self.phases.append(entry)
+        stack.append(entry)
+
+    def end(self):
+        if not self.enabled:
+            return
+        stack = self._open_stack()
+        if not stack:
+            return
+        entry = stack.pop()
+        entry[2] = time.perf_counter() - self.start - entry[1]
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def mark(self, name):
+        """Record an instant (e.g. "first frame drawn")."""
+        if self.enabled:
+            self.phases.append([self._label(name), time.perf_counter() - self.start, 0.0,
+                                len(self._open_stack())])
+
+    def report(self):
+        """Print the phase table to stderr, or write it as JSON (once)."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+
+        total = time.perf_counter() - self.start
+        self.phases.sort(key=lambda entry: entry[1])
+        if self.output:
+            data = {
+                "total_ms": round(total * 1000, 3),
+                "phases": [
+                    {
+                        "name": name,
+                        "start_ms": round(start * 1000, 3),
+                        "duration_ms": round(duration * 1000, 3),
+                        "depth": depth,
+                    }
+                    for name, start, duration, depth in self.phases
+                ],
+            }
+            try:
+                with open(self.output, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2)
+            except Exception as e:
+                print(f"Error writing startup profile: {e}", file=sys.stderr)
+            return
+
+        print(f"{'phase':<44} {'start ms':>10} {'took ms':>10}", file=sys.stderr)
+        for name, start, duration, depth in self.phases:
+            label = "  " * depth + name
+            print(f"{label:<44} {start * 1000:>10.1f} {duration * 1000:>10.1f}", file=sys.stderr)
+        print(f"{'total':<44} {'':>10} {total * 1000:>10.1f}", file=sys.stderr)
@@ -0,0 +1,115 @@
+"""
+Default English strings of GeppEmoji's dialogs (fallback if no locale file
+has them).
+
+The main window only needs the few strings in geppemoji.DEFAULT_I18N; these
+are imported the first time a dialog asks for one of them.
+"""
+
+DIALOG_I18N = {
+    "instructions.title": "Instructions",
+    "instructions.body": (
+        "How to use GeppEmoji:\n\n"
+        "- On startup it shows the 'Recent' category and focuses the search entry.\n"
+        "- Choose a category or use 'Recent' to see your last used emoji.\n"
+        "- Type in the search box to filter emoji by name or keyword.\n\n"
+        "Mouse / Keyboard:\n"
+        "- Left click or Enter: insert the emoji (or accumulated emoji) and close.\n"
+        "- Shift + left click, right click or Shift + Enter: add the emoji to the buffer without closing.\n"
+        "- Middle click or Shift + T: edit custom keywords for the selected emoji.\n"
+        "- Ctrl + F: toggle favorite for the selected emoji.\n"
+        "- Esc: close the window without doing anything."
+    ),
+
+    "shortcuts.title": "Shortcuts",
+    "shortcuts.body": (
+        "Keyboard and mouse shortcuts in GeppEmoji:\n\n"
+        "- Arrow keys: move between emoji.\n"
+        "- Enter: insert and paste the current emoji (plus any emoji already in the buffer).\n"
+        "- Shift + Enter: add to buffer, do not paste.\n"
+        "- Left click: insert and paste.\n"
+        "- Shift + left click: add to buffer, do not paste.\n"
+        "- Right click: add to buffer, do not paste.\n"
+        "- Middle click: open the keyword editor for that emoji.\n"
+        "- Shift + T: open the keyword editor for the selected emoji.\n"
+        "- Ctrl + F: toggle favorite for the selected emoji.\n"
+        "- Esc: close the window."
+    ),
+
+    "about.title": "About",
+    "about.body": (
+        "{app_name}\n\n"
+        "Emoji picker with localized search, categories, favorites and recents.\n\n"
+        "Developed by Francesco Bianchi with the help of Geppetto AI."
+    ),
+
+    "update.title": "Update Emoji database",
+    "update.button.run": "Run import",
+    "update.heading": "How to update the Emoji database",
+    "update.step1": "1. Open the following link in your browser and save the file:",
+    "update.step2": (
+        "2. Save the file as <b>emoji-test.txt</b> into the application folder:\n"
+        "<tt>{base_dir}</tt>\n\n"
+        "3. After copying the file into the correct folder,\n"
+        "   press the button below to start the import process\n"
+        "   for the new Emoji into the app database."
+    ),
+    "update.error.title": "Update error",
+    "update.error.body": "Error while running build_emoji_db.py:\n{error}",
+    "update.success.title": "Updated",
+    "update.success.body": (
+        "Emoji database updated successfully.\n\n"
+        "New emoji should now be visible in the app."
+    ),
+    "update.unchanged.title": "Already up to date",
+    "update.unchanged.body": "emoji-test.txt and emoji_translations.json did not change: nothing to import.",
+    "update.stage.start": "Updating emoji…",
+    "update.stage.download": "Downloading emoji-test.txt…",
+    "update.stage.parse": "Building the emoji database…",
+    "update.stage.load": "Loading the new emoji…",
+
+    "editor.title": "Edit emoji keywords",
+    "editor.search_label": "Search key for emoji: {emoji}",
+    "editor.desc": "Add your own search keywords here, separated by a comma \",\"",
+    "editor.defaults_title": "Default keywords for {emoji} are:",
+    "editor.defaults.none": "(none)",
+
+    "msg.error.xdotool_activate": "Error using xdotool (windowactivate): {error}",
+    "msg.error.xdotool_key": "Error using xdotool (key ctrl+v): {error}",
+
+    # Preferences / config
+    "prefs.title": "Preferences",
+    "prefs.theme": "Theme",
+    "prefs.theme.system": "System",
+    "prefs.theme.light": "Light",
+    "prefs.theme.dark": "Dark",
+    "prefs.columns": "Columns",
+    "prefs.max_recent": "Max recent emoji",
+    "prefs.font_size": "Emoji font size",
+    "prefs.language": "Language",
+    "prefs.language.system": "System default",
+    "prefs.grid_mode": "Emoji grid",
+    "prefs.grid_mode.flowbox": "Classic",
+    "prefs.grid_mode.virtual": "Virtualized (faster startup)",
+    "prefs.grid_mode.drawn": "Custom-drawn (smooth at large sizes)",
+    "prefs.max_version": "Show emoji up to version",
+    "prefs.max_version.all": "All",
+    "prefs.debug": "Enable debug log (also richer tooltips)",
+    "prefs.open_translations": "Open emoji_translations.json",
+    "prefs.open_config": "Open config.json",
+    "prefs.backup": "Create backup...",
+    "prefs.restore": "Restore backup...",
+
+    "prefs.backup_done_title": "Backup created",
+    "prefs.backup_done_body": "Backup saved as:\n{path}",
+    "prefs.backup_error_title": "Backup error",
+    "prefs.backup_error_body": "Error during backup:\n{error}",
+    "prefs.restore_done_title": "Backup restored",
+    "prefs.restore_done_body": "Backup restored.\nYou may need to restart GeppEmoji.",
+    "prefs.restore_error_title": "Restore error",
+    "prefs.restore_error_body": "Error during restore:\n{error}",
+    "prefs.language_changed_title": "Language changed",
+    "prefs.language_changed_body": "Language will be applied next time you start GeppEmoji.",
+    "prefs.grid_mode_changed_title": "Emoji grid changed",
+    "prefs.grid_mode_changed_body": "The new emoji grid will be used next time you start GeppEmoji.",
+}
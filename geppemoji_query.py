@@ -0,0 +1,218 @@
+"""
+GTK-free command-line search for GeppEmoji (`geppemoji.py --query ...`).
+
+Uses the same data files, translations, favorites and keyword search as
+the picker, but never imports `gi`, so it starts fast enough to back a
+rofi / dmenu launcher or a shell pipeline:
+
+    geppemoji.py --query heart --lang it --limit 20
+    geppemoji.py --query "" --format tsv | rofi -dmenu      # every emoji
+    geppemoji.py --batch --limit 1 < names.txt               # one query per line
+
+TSV output has one emoji per line: char, name, shortcode, category and
+favorite ("1" / "0"); --batch prefixes each line with the query. JSON output
+is an array for a single query and one JSON object per query (JSON Lines)
+with --batch, written as soon as that query is answered.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from geppemoji_core import (
+    SearchIndex,
+    SnapshotCache,
+    emoji_data_inputs,
+    get_display_name,
+    get_system_language,
+    prepare_emoji_data,
+    read_json_file,
+    snapshot_file,
+    toned_variant,
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EMOJI_FILE = os.path.join(BASE_DIR, "emoji_data.json")
+EMOJI_BIN_FILE = os.path.join(BASE_DIR, "emoji_data.bin")
+LANGUAGE_PACKS_DIR = os.path.join(BASE_DIR, "emoji_packs")
+TRANSLATIONS_FILE = os.path.join(BASE_DIR, "emoji_translations.json")
+FAVORITES_FILE = os.path.join(BASE_DIR, "emoji_favorites.json")
+CONFIG_FILE = os.path.join(BASE_DIR, "config.json")
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "cache")
+
+# Building the trigram index costs more than scanning the keywords once,
+# so it is only built when more than this many queries come in (--batch).
+SCAN_QUERIES = 1
+
+
+def is_query_mode(argv):
+    """True if the command line asks for the command-line search."""
+    return any(arg in ("--batch", "--query") or arg.startswith("--query=") for arg in argv)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="geppemoji.py",
+        description="Search emoji from the command line (no GUI).",
+    )
+    parser.add_argument("--query", metavar="TEXT", help="text to search (\"\" lists every emoji)")
+    parser.add_argument("--batch", action="store_true",
+                        help="read one query per line from stdin")
+    parser.add_argument("--lang", help="language of names and keywords (default: as in the app)")
+    parser.add_argument("--limit", type=int, default=0, help="max results per query (0 = all)")
+    parser.add_argument("--format", choices=("tsv", "json"), default="tsv", help="output format")
+    parser.add_argument("--tone", type=int, choices=range(6), default=0,
+                        help="skin tone 1-5 for emoji that have one (default: none)")
+    parser.add_argument("--max-version", type=float, metavar="VERSION",
+                        help="hide emoji newer than this emoji version "
+                             "(default: as in the app, 0 = show all)")
+    args = parser.parse_args(argv)
+    if args.query is None and not args.batch:
+        parser.error("--query or --batch is required")
+    return args
+
+
+def default_language(config):
+    """The app's language: config.json's "language", else the system one."""
+    language = config.get("language", "system")
+    if language and language != "system":
+        return language
+    return get_system_language()
+
+
+class QueryData:
+    """
+    Only what --query prints and searches, per emoji (id = list position):
+    (char, display name, shortcode, category, skin tones), the emoji
+    version and the search keywords joined by "\\0". It has a snapshot of its
+    own, which loads several times faster than the picker's EmojiData.
+    """
+
+    def __init__(self, data, language):
+        items = data.items
+        self.rows = [
+            (item.char, get_display_name(item, language), item.shortcode, item.category,
+             item.skin_tones)
+            for item in items
+        ]
+        self.versions = [item.version for item in items]
+        self.haystacks = list(data.index.haystacks)
+        # Favorites flagged in the data, used when there is no favorites file
+        self.favorites = {item.char for item in items if item.favorite and item.char}
+
+
+class EmojiQuery:
+    """The emoji of one language, ready to be searched and printed."""
+
+    def __init__(self, language, tone=0, max_version=0):
+        self.tone = tone
+
+        # Reuse the lean snapshot when it is fresh; otherwise go through the
+        # picker's data (and its snapshot) and leave one for next time.
+        snapshot = SnapshotCache(
+            snapshot_file(SNAPSHOT_DIR, language, "query"),
+            emoji_data_inputs(language, EMOJI_FILE, EMOJI_BIN_FILE, LANGUAGE_PACKS_DIR,
+                              TRANSLATIONS_FILE),
+            language,
+            QueryData,
+        )
+        data = snapshot.load()
+        if data is None:
+            stamp = snapshot.stamp()
+            data = QueryData(
+                prepare_emoji_data(language, EMOJI_FILE, EMOJI_BIN_FILE, LANGUAGE_PACKS_DIR,
+                                   TRANSLATIONS_FILE, SNAPSHOT_DIR),
+                language,
+            )
+            snapshot.save(data, stamp)
+        self.data = data
+
+        favorites = read_json_file(FAVORITES_FILE, list)
+        self.favorites = set(favorites) if favorites is not None else data.favorites
+        self.allowed = None
+        if max_version:
+            # Emoji of unknown version (0.0) are always included
+            self.allowed = {i for i, v in enumerate(data.versions) if v <= max_version}
+        self.index = None
+        self.lookups = 0
+
+    def search(self, text, limit=0):
+        """Return the ids of the matching emoji, in list order (like the picker's grid)."""
+        text = text.strip().lower()
+        self.lookups += 1
+        if self.index is None and self.lookups > SCAN_QUERIES:
+            self.index = SearchIndex([h.split("\0") if h else [] for h in self.data.haystacks])
+
+        if self.index is not None:
+            ids = self.index.search(text)
+        elif text:
+            ids = [i for i, haystack in enumerate(self.data.haystacks) if text in haystack]
+        else:
+            ids = range(len(self.data.haystacks))
+        if self.allowed is not None:
+            ids = [i for i in ids if i in self.allowed]
+        ids = sorted(ids)
+        if limit > 0:
+            ids = ids[:limit]
+        return ids
+
+    def record(self, item_id):
+        char, name, shortcode, category, skin_tones = self.data.rows[item_id]
+        return {
+            "char": toned_variant(char, skin_tones, self.tone),
+            "name": name,
+            "shortcode": shortcode,
+            "category": category,
+            "favorite": char in self.favorites,
+        }
+
+
+def tsv_field(value):
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def write_results(out, query, records, fmt, batch):
+    if fmt == "json":
+        if batch:
+            out.write(json.dumps({"query": query, "results": records}, ensure_ascii=False) + "\n")
+        else:
+            out.write(json.dumps(records, ensure_ascii=False, indent=2) + "\n")
+        return
+
+    prefix = tsv_field(query) + "\t" if batch else ""
+    for r in records:
+        fields = [r["char"], r["name"], r["shortcode"], r["category"], "1" if r["favorite"] else "0"]
+        out.write(prefix + "\t".join(tsv_field(f) for f in fields) + "\n")
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    config = read_json_file(CONFIG_FILE) or {}
+    max_version = args.max_version
+    if max_version is None:
+        max_version = config.get("max_emoji_version", 0)
+    engine = EmojiQuery(args.lang or default_language(config), args.tone, max_version)
+    out = sys.stdout
+
+    try:
+        if args.query is not None:
+            records = [engine.record(i) for i in engine.search(args.query, args.limit)]
+            write_results(out, args.query, records, args.format, args.batch)
+        if args.batch:
+            for line in sys.stdin:
+                query = line.rstrip("\r\n")
+                records = [engine.record(i) for i in engine.search(query, args.limit)]
+                write_results(out, query, records, args.format, True)
+                # Stream: the reader may be waiting for this answer
+                out.flush()
+        out.flush()
+    except BrokenPipeError:
+        # e.g. `... | head`: stop quietly, without a traceback at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, out.fileno())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
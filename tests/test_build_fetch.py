@@ -0,0 +1,122 @@
+"""Conditional download of emoji-test.txt and the skip of unchanged builds."""
+
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import build_emoji_db
+
+EMOJI_TEST = """\
+# group: Smileys & Emotion
+1F600                                      ; fully-qualified     # 😀 E1.0 grinning face
+263A FE0F                                  ; fully-qualified     # ☺️ E0.6 smiling face
+263A                                       ; unqualified         # ☺ E0.6 smiling face
+# group: People & Body
+1F44B                                      ; fully-qualified     # 👋 E0.6 waving hand
+1F44B 1F3FB                                ; fully-qualified     # 👋🏻 E1.0 waving hand: light skin tone
+""".encode("utf-8")
+
+ETAG = '"emoji-test-v1"'
+LAST_MODIFIED = "Mon, 01 Sep 2025 10:00:00 GMT"
+
+
+class EmojiTestHandler(BaseHTTPRequestHandler):
+    """Serve EMOJI_TEST, answering 304 to a request with a matching validator."""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if (self.headers.get("If-None-Match") == ETAG
+                or self.headers.get("If-Modified-Since") == LAST_MODIFIED):
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(EMOJI_TEST)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(EMOJI_TEST)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FetchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EmojiTestHandler)
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/emoji-test.txt"
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.source_path = os.path.join(self.dir, build_emoji_db.LOCAL_EMOJI_TEST)
+
+    def fetch(self, cache):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return build_emoji_db.fetch_emoji_test(self.url, self.source_path, cache)
+
+    def test_download_stores_validators(self):
+        cache = {}
+        self.assertEqual(self.fetch(cache), "modified")
+
+        with open(self.source_path, "rb") as f:
+            self.assertEqual(f.read(), EMOJI_TEST)
+        self.assertEqual(cache, {"url": self.url, "etag": ETAG, "last_modified": LAST_MODIFIED})
+        # No local copy yet: the first request is unconditional
+        self.assertNotIn("If-None-Match", self.server.requests[0])
+        self.assertNotIn("If-Modified-Since", self.server.requests[0])
+
+    def test_not_modified_reuses_local_copy(self):
+        cache = {}
+        self.fetch(cache)
+        before = os.stat(self.source_path)
+
+        self.assertEqual(self.fetch(cache), "not-modified")
+
+        self.assertEqual(self.server.requests[1].get("If-None-Match"), ETAG)
+        self.assertEqual(self.server.requests[1].get("If-Modified-Since"), LAST_MODIFIED)
+        after = os.stat(self.source_path)
+        self.assertEqual((after.st_ino, after.st_mtime_ns), (before.st_ino, before.st_mtime_ns))
+        with open(self.source_path, "rb") as f:
+            self.assertEqual(f.read(), EMOJI_TEST)
+
+    def test_unchanged_inputs_skip_build(self):
+        original_script_path = build_emoji_db.script_path
+        build_emoji_db.script_path = lambda name: os.path.join(self.dir, name)
+        self.addCleanup(setattr, build_emoji_db, "script_path", original_script_path)
+        output_path = os.path.join(self.dir, build_emoji_db.OUTPUT_FILE)
+        binary_path = os.path.join(self.dir, build_emoji_db.BINARY_OUTPUT_FILE)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(build_emoji_db.main(["--url", self.url]), 0)
+        built = [os.stat(path).st_ino for path in (output_path, binary_path)]
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(build_emoji_db.main(["--url", self.url]), 0)
+
+        self.assertIn("nothing to rebuild", out.getvalue())
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[1].get("If-None-Match"), ETAG)
+        # The outputs were not rewritten (a rebuild replaces the files)
+        self.assertEqual([os.stat(path).st_ino for path in (output_path, binary_path)], built)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(build_emoji_db.main(["--url", self.url, "--force"]), 0)
+        self.assertNotEqual([os.stat(path).st_ino for path in (output_path, binary_path)], built)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Import-time budgets of the entry points (see benchmarks/import_budget.py)."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "benchmarks"))
+
+import import_budget  # noqa: E402
+
+# Timings depend on the machine and its load: they are only checked when
+# $GEPPEMOJI_IMPORT_BUDGET_SCALE sets the slack to give the budgets (e.g. 2)
+SCALE = os.environ.get("GEPPEMOJI_IMPORT_BUDGET_SCALE")
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       300 |        420 | json.decoder
+import time:       200 |        200 |     zipfile
+import time:        50 |        250 |   geppemoji_extra
+import time:      1000 |       1000 |   gi
+import time:       400 |       2070 | geppemoji_core
+"""
+
+
+class ParseTestCase(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        nodes = import_budget.parse_importtime(REPORT)
+        self.assertEqual([n.name for n in nodes], ["json.decoder", "geppemoji_core"])
+        core = nodes[1]
+        self.assertEqual(core.cumulative_us, 2070)
+        self.assertEqual([n.name for n in core.children], ["geppemoji_extra", "gi"])
+        self.assertEqual(core.children[0].children[0].name, "zipfile")
+
+    def test_external_and_deferred(self):
+        core = import_budget.parse_importtime(REPORT)[1]
+        self.assertEqual(import_budget.external_us([core]), 1000)
+        self.assertEqual(import_budget.deferred_imports(core), [("geppemoji_extra", "zipfile")])
+
+
+class BudgetTestCase(unittest.TestCase):
+
+    def test_deferred_imports(self):
+        for module, _budget_ms in import_budget.TARGETS:
+            with self.subTest(module=module):
+                _own_ms, _ext_ms, node, error = import_budget.measure(module, repeat=1)
+                if error:
+                    self.skipTest(f"{module} cannot be imported here: {error}")
+                self.assertEqual(import_budget.deferred_imports(node), [])
+
+    @unittest.skipUnless(SCALE, "set GEPPEMOJI_IMPORT_BUDGET_SCALE to check import times")
+    def test_budgets(self):
+        for module, budget_ms in import_budget.TARGETS:
+            with self.subTest(module=module):
+                own_ms, _ext_ms, _node, error = import_budget.measure(module, repeat=5)
+                if error:
+                    self.skipTest(f"{module} cannot be imported here: {error}")
+                self.assertLessEqual(own_ms, budget_ms * float(SCALE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Custom keywords merged into / edited on the emoji records."""
+
+import unittest
+
+from geppemoji_core import (
+    Emoji,
+    SearchIndex,
+    get_all_keywords,
+    merge_translations,
+    search_keywords,
+    set_custom_keywords,
+)
+
+
+def heart():
+    return Emoji("❤️", shortcode=":red_heart:", category="Smileys & Emotion",
+                 names={"en": "red heart", "it": "cuore rosso"},
+                 keywords={"en": ("heart", "love"), "it": ("amore", "cuore")})
+
+
+class CustomKeywordsTestCase(unittest.TestCase):
+
+    def test_merge_records_defaults(self):
+        item = heart()
+        translations = {"by_char": {"❤️": {"keywords": {"it": ["cuore", "san valentino"]}}}}
+        defaults = {}
+        merge_translations([item], translations, "it", defaults)
+
+        self.assertEqual(item.keywords["it"], ("amore", "cuore", "san valentino"))
+        self.assertEqual(defaults[("❤️", "it")], ("amore", "cuore"))
+
+    def test_removing_custom_keeps_default(self):
+        item = heart()
+        translations = {"by_char": {"❤️": {"keywords": {"it": ["cuore", "san valentino"]}}}}
+        defaults = {}
+        merge_translations([item], translations, "it", defaults)
+
+        # "cuore" is both custom and default: removing it keeps the default
+        set_custom_keywords(item, "it", [], defaults)
+        self.assertEqual(item.keywords["it"], ("amore", "cuore"))
+
+    def test_edit_without_merged_customs(self):
+        item = heart()
+        defaults = {}
+        set_custom_keywords(item, "it", ["passione"], defaults)
+        self.assertEqual(item.keywords["it"], ("amore", "cuore", "passione"))
+
+        set_custom_keywords(item, "it", ["affetto"], defaults)
+        self.assertEqual(item.keywords["it"], ("affetto", "amore", "cuore"))
+
+    def test_edit_replaces_precomputed_search(self):
+        # Records built from the DB carry the search keywords of build_emoji_db.py
+        item = heart()
+        item.search = {lang: search_keywords(item.names, item.keywords, item.extra,
+                                             item.shortcode, lang)
+                       for lang in ("en", "it")}
+        other = Emoji("🐱", shortcode=":cat_face:", names={"en": "cat face", "it": "gatto"},
+                      keywords={"it": ("gatto",)})
+        emoji_list = [item, other]
+        index = SearchIndex([get_all_keywords(e, "it") for e in emoji_list])
+        defaults = {}
+
+        set_custom_keywords(item, "it", ["passione"], defaults)
+        index.update_item(0, get_all_keywords(item, "it"))
+        self.assertEqual(index.search("passione"), {0})
+
+        set_custom_keywords(item, "it", [], defaults)
+        index.update_item(0, get_all_keywords(item, "it"))
+        self.assertEqual(index.search("passione"), frozenset())
+        self.assertEqual(index.search("cuore"), {0})
+        # Other languages keep their precomputed keywords
+        self.assertIn("en", item.search)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Warm-start snapshots shared by the picker and --query."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import geppemoji_query
+from geppemoji_core import EmojiData, SnapshotCache, prepare_emoji_data, snapshot_file
+
+EMOJI_DATA = [
+    {"char": "❤️", "codepoints": "2764 FE0F", "shortcode": ":red_heart:",
+     "category": "Smileys & Emotion", "version": 0.6,
+     "names": {"en": "red heart"}, "keywords": {"en": ["heart", "love"]}},
+    {"char": "🐱", "codepoints": "1F431", "shortcode": ":cat_face:",
+     "category": "Animals & Nature", "version": 0.6,
+     "names": {"en": "cat face"}, "keywords": {"en": ["cat", "pet"]}},
+]
+
+TRANSLATIONS = {"by_char": {"🐱": {"keywords": {"en": ["kitty"]}}}}
+
+
+class SharedSnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.paths = {
+            "EMOJI_FILE": os.path.join(self.dir, "emoji_data.json"),
+            "EMOJI_BIN_FILE": os.path.join(self.dir, "emoji_data.bin"),
+            "LANGUAGE_PACKS_DIR": os.path.join(self.dir, "emoji_packs"),
+            "TRANSLATIONS_FILE": os.path.join(self.dir, "emoji_translations.json"),
+            "FAVORITES_FILE": os.path.join(self.dir, "emoji_favorites.json"),
+            "SNAPSHOT_DIR": os.path.join(self.dir, "cache"),
+        }
+        with open(self.paths["EMOJI_FILE"], "w", encoding="utf-8") as f:
+            json.dump(EMOJI_DATA, f)
+        with open(self.paths["TRANSLATIONS_FILE"], "w", encoding="utf-8") as f:
+            json.dump(TRANSLATIONS, f)
+        for name, path in self.paths.items():
+            self.addCleanup(setattr, geppemoji_query, name, getattr(geppemoji_query, name))
+            setattr(geppemoji_query, name, path)
+
+    def picker_data(self):
+        # What GeppEmoji.load_data() runs
+        p = self.paths
+        return prepare_emoji_data("en", p["EMOJI_FILE"], p["EMOJI_BIN_FILE"],
+                                  p["LANGUAGE_PACKS_DIR"], p["TRANSLATIONS_FILE"],
+                                  p["SNAPSHOT_DIR"])
+
+    def query_chars(self, text):
+        engine = geppemoji_query.EmojiQuery("en")
+        return [engine.record(item)["char"] for item in engine.search(text)]
+
+    def assert_picker_data(self, data):
+        self.assertIsInstance(data, EmojiData)
+        self.assertEqual([item.char for item in data.items], ["❤️", "🐱"])
+        self.assertEqual(data.index.search("kitty"), {1})
+        self.assertEqual(data.default_keywords[("🐱", "en")], ("cat", "pet"))
+
+    def test_picker_then_query(self):
+        self.assert_picker_data(self.picker_data())
+        self.assertTrue(os.listdir(self.paths["SNAPSHOT_DIR"]))
+        self.assertEqual(self.query_chars("kitty"), ["🐱"])
+        self.assertEqual(self.query_chars("heart"), ["❤️"])
+
+    def test_query_then_picker(self):
+        self.assertEqual(self.query_chars("kitty"), ["🐱"])
+        self.assertTrue(os.listdir(self.paths["SNAPSHOT_DIR"]))
+        self.assert_picker_data(self.picker_data())
+        # Both again, now from the snapshots
+        self.assertEqual(self.query_chars("pet"), ["🐱"])
+        self.assert_picker_data(self.picker_data())
+
+    def test_other_kind_is_a_miss(self):
+        path = snapshot_file(self.paths["SNAPSHOT_DIR"], "en")
+        inputs = [self.paths["EMOJI_FILE"]]
+        other = SnapshotCache(path, inputs, "en", tuple)
+        other.save(("translations", [], None), other.stamp())
+
+        self.assertIsNone(SnapshotCache(path, inputs, "en", EmojiData).load())
+        self.assertEqual(other.load(), ("translations", [], None))
+
+
+if __name__ == "__main__":
+    unittest.main()